@@ -0,0 +1,179 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import PIL
+import create_high_quality_backgrounds as generator
+
+# 배경 생성기 벤치마크
+# 방 생성 함수와 공용 헬퍼를 여러 해상도에서 실행해 실행 시간, tracemalloc 최대 메모리,
+# JPEG 출력 크기를 측정하고 JSON으로 저장하거나 저장된 기준값과 비교한다.
+#
+#   python benchmark_backgrounds.py --output bench.json
+#   python benchmark_backgrounds.py --save-baseline bench_baseline.json
+#   python benchmark_backgrounds.py --baseline bench_baseline.json --threshold 1.2
+
+DEFAULT_SIZES = "800x480,1280x720,1920x1080"
+BENCH_SEED = 1973
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def encoded_size(img, quality):
+    """JPEG로 저장했을 때의 바이트 크기"""
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.tell()
+
+def room_case(name, size):
+    """방 배경 생성 (기본 해상도로 그린 뒤 목표 해상도로 리샘플링)"""
+    def run():
+        return generator.resize_variant(generator.generate_room(name, BENCH_SEED), size)
+    return run
+
+def noise_case(size):
+    def run():
+        return generator.create_noise_texture(size[0], size[1], 1, rng=random.Random(BENCH_SEED))
+    return run
+
+def gradient_case(size):
+    def run():
+        return generator.create_gradient_overlay(size[0], size[1], (10, 10, 15), (5, 5, 8))
+    return run
+
+def collect_cases(rooms, sizes):
+    """(이름, 해상도, 실행 함수) 목록"""
+    cases = []
+    for size in sizes:
+        cases.append(("create_noise_texture", size, noise_case(size)))
+        cases.append(("create_gradient_overlay", size, gradient_case(size)))
+        for name in rooms:
+            cases.append((f"room:{name}", size, room_case(name, size)))
+    return cases
+
+def measure(run, repeat, quality):
+    """실행 시간(최소/중앙값), 최대 메모리, 출력 크기 측정"""
+    # 시간 측정은 tracemalloc 없이 따로 해서 추적 오버헤드가 섞이지 않게 함
+    times = []
+    img = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        img = run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "peak_bytes": peak,
+        "output_bytes": encoded_size(img, quality),
+    }
+
+def case_key(name, size):
+    return f"{name}@{size[0]}x{size[1]}"
+
+def run_benchmarks(rooms, sizes, repeat, quality):
+    results = {}
+    for name, size, run in collect_cases(rooms, sizes):
+        key = case_key(name, size)
+        results[key] = measure(run, repeat, quality)
+        r = results[key]
+        print(f"{key:<40} {r['time_median'] * 1000:9.1f}ms  "
+              f"최대 {r['peak_bytes'] / 1024:9.1f}KB  출력 {r['output_bytes'] / 1024:8.1f}KB")
+    return results
+
+def compare(results, baseline, threshold):
+    """기준값 대비 느려진 항목 목록 반환 (중앙값 시간 비율이 threshold 초과)"""
+    regressions = []
+    print("\n기준값 비교 (중앙값 시간 비율):")
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            print(f"  {key:<40} 기준값 없음")
+            continue
+        ratio = result["time_median"] / base["time_median"] if base["time_median"] > 0 else float("inf")
+        memory_ratio = result["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] > 0 else 1.0
+        mark = ""
+        if ratio > threshold:
+            mark = "  ← 느려짐"
+            regressions.append(key)
+        print(f"  {key:<40} 시간 x{ratio:5.2f}  메모리 x{memory_ratio:5.2f}{mark}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="배경 생성기 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"측정할 해상도 목록 (기본: {DEFAULT_SIZES})")
+    parser.add_argument("--only", default="",
+                        help="측정할 방 목록 (쉼표로 구분, 기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="항목별 반복 횟수 (기본: 3)")
+    parser.add_argument("--quality", type=int, default=generator.JPEG_QUALITY,
+                        help="출력 크기 측정에 쓸 JPEG 품질")
+    parser.add_argument("--output", help="측정 결과를 저장할 JSON 파일")
+    parser.add_argument("--save-baseline", help="측정 결과를 기준값 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 기준값 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="이 비율보다 느려지면 회귀로 판단 (기본: 1.2)")
+    args = parser.parse_args(argv)
+
+    try:
+        args.sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes는 800x480,1280x720 형식이어야 합니다")
+    if args.only:
+        args.rooms = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in args.rooms if name not in generator.ROOM_BUILDERS]
+        if unknown:
+            parser.error(f"알 수 없는 방: {', '.join(unknown)}")
+    else:
+        args.rooms = list(generator.ROOM_BUILDERS)
+    if args.repeat < 1:
+        parser.error("--repeat는 1 이상이어야 합니다")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.rooms, args.sizes, args.repeat, args.quality)
+
+    report = {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"\n결과 저장: {path}")
+
+    if args.baseline:
+        if not os.path.isfile(args.baseline):
+            print(f"기준값 파일이 없습니다: {args.baseline}")
+            return 2
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 기준값보다 {args.threshold}배 이상 느려졌습니다.")
+            return 1
+        print("\n기준값 대비 회귀 없음.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+# 증분 빌드 캐시
+# 각 산출물의 입력 지문(fingerprint)과 산출물 해시를 매니페스트에 기록해 두고,
+# 다음 빌드에서 둘 다 그대로면 다시 만들지 않는다.
+
+MANIFEST_VERSION = 2
+
+def fingerprint(*parts):
+    """입력 값들을 하나의 SHA-256 지문으로 합침"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        elif not isinstance(part, bytes):
+            part = repr(part).encode('utf-8')
+        # 길이를 함께 넣어 ("ab", "c")와 ("a", "bc")가 같은 지문이 되지 않게 함
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+def file_digest(path):
+    """파일 내용의 SHA-256 해시 (파일이 없으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+class BuildManifest:
+    """산출물별 입력 지문과 출력 해시를 담는 매니페스트 파일"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('entries', {})
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'entries': self.entries}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def is_up_to_date(self, key, input_fingerprint, outputs):
+        """입력 지문이 같고 모든 출력 파일이 기록된 내용 그대로인지 확인
+
+        크기와 수정 시각이 기록과 같으면 해시 계산 없이 최신으로 본다.
+        """
+        entry = self.entries.get(key)
+        if not entry or entry.get('fingerprint') != input_fingerprint:
+            return False
+        recorded = entry.get('outputs', {})
+        if set(recorded) != {os.path.basename(path) for path in outputs}:
+            return False
+        for path in outputs:
+            info = recorded[os.path.basename(path)]
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != info.get('size'):
+                return False
+            if stat.st_mtime_ns != info.get('mtime_ns') and file_digest(path) != info.get('sha256'):
+                return False
+        return True
+
+    def record(self, key, input_fingerprint, outputs):
+        recorded = {}
+        for path in outputs:
+            stat = os.stat(path)
+            recorded[os.path.basename(path)] = {
+                'sha256': file_digest(path),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+            }
+        self.entries[key] = {'fingerprint': input_fingerprint, 'outputs': recorded}
@@ -1,53 +1,56 @@
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, ImageOps
+from PIL import Image, ImageDraw, ImageEnhance, ImageOps
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
 import os
 import random
 import math
+import inspect
+import json
+import time
 
-# assets 폴더 생성
-if not os.path.exists('assets'):
-    os.makedirs('assets')
+import PIL
+import gradients
+import lighting
+import rawimage
+import scene
+import textures
+from build_cache import BuildManifest, fingerprint
+from gradients import linear_gradient
+from lighting import PointLight, composite_lights
+from textures import create_noise_texture
+
+# 에셋 폴더 (게임과 같은 위치)
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
 
 # 화면 크기
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
-def create_noise_texture(width, height, scale=50):
-    """노이즈 텍스처 생성"""
-    img = Image.new('RGB', (width, height))
-    pixels = img.load()
-    
-    for x in range(width):
-        for y in range(height):
-            noise = random.randint(0, 255)
-            pixels[x, y] = (noise, noise, noise)
-    
-    # 블러 효과
-    img = img.filter(ImageFilter.GaussianBlur(scale))
-    return img
+# JPEG 저장 품질
+JPEG_QUALITY = 95
+
+# 증분 빌드 매니페스트 (에셋 옆에 저장)
+MANIFEST_PATH = os.path.join(ASSETS_DIR, 'build_manifest.json')
+
+# 해상도별 에셋 목록 (게임이 화면 크기에 맞는 파일을 고를 때 사용)
+PYRAMID_PATH = os.path.join(ASSETS_DIR, 'pyramid.json')
+
+# 기본 해상도와 함께 만들 해상도 (키오스크 화면 크기)
+DEFAULT_SIZES = "1280x720,1920x1080,800x480"
+
+_compiled_scenes = {}
+
+def render_room_scene(name, rng=random):
+    """scenes 폴더의 장면 파일로 방 배경 생성 (컴파일 결과는 재사용)"""
+    if name not in _compiled_scenes:
+        _compiled_scenes[name] = scene.load_scene(name)
+    return _compiled_scenes[name].render(rng)
 
 def create_gradient_overlay(width, height, color1, color2, direction='vertical'):
     """그라데이션 오버레이 생성"""
-    img = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(img)
-    
-    if direction == 'vertical':
-        for y in range(height):
-            ratio = y / height
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-    else:
-        for x in range(width):
-            ratio = x / width
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            draw.line([(x, 0), (x, height)], fill=(r, g, b))
-    
-    return img
+    return linear_gradient(width, height, color1, color2, direction)
 
-def create_exterior():
+def create_exterior(rng=random):
     """병원 외부 - 고품질 어두운 병원 건물"""
     # 기본 배경 (어두운 하늘)
     sky_gradient = create_gradient_overlay(SCREEN_WIDTH, SCREEN_HEIGHT//2, (10, 10, 15), (5, 5, 8))
@@ -78,7 +81,7 @@ def create_exterior():
             draw.rectangle([x, y, x+60, y+40], fill=(darkness+5, darkness+5, darkness+5))
             
             # 창문 유리 (어두운 노란색)
-            if random.random() < 0.3:  # 30% 확률로 불이 켜진 창문
+            if rng.random() < 0.3:  # 30% 확률로 불이 켜진 창문
                 draw.rectangle([x+5, y+5, x+55, y+35], fill=(40, 35, 20))
             else:
                 draw.rectangle([x+5, y+5, x+55, y+35], fill=(darkness+2, darkness+2, darkness+2))
@@ -102,10 +105,10 @@ def create_exterior():
     fog_draw = ImageDraw.Draw(fog)
     
     for i in range(30):
-        x = random.randint(0, SCREEN_WIDTH)
-        y = random.randint(SCREEN_HEIGHT-150, SCREEN_HEIGHT)
-        size = random.randint(50, 150)
-        alpha = random.randint(10, 40)
+        x = rng.randint(0, SCREEN_WIDTH)
+        y = rng.randint(SCREEN_HEIGHT-150, SCREEN_HEIGHT)
+        size = rng.randint(50, 150)
+        alpha = rng.randint(10, 40)
         fog_draw.ellipse([x-size//2, y-size//4, x+size//2, y+size//4], fill=(100, 100, 100, alpha))
     
     # 최종 이미지 조합
@@ -118,9 +121,9 @@ def create_exterior():
     enhancer = ImageEnhance.Brightness(final_img)
     final_img = enhancer.enhance(0.7)
     
-    final_img.save('assets/exterior.jpg', quality=95)
+    return final_img
 
-def create_lobby():
+def create_lobby(rng=random):
     """로비 - 고품질 어두운 로비"""
     # 기본 배경 (어두운 벽과 바닥)
     img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (5, 5, 5))
@@ -134,12 +137,13 @@ def create_lobby():
             draw.rectangle([x, y, x+tile_size, y+tile_size], fill=color)
     
     # 벽 (텍스처 추가)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-200, 2)
+    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-200, 2, rng=rng)
     wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-200), (8, 8, 8))
     wall_overlay = Image.blend(wall_overlay, wall_noise, 0.3)
     img.paste(wall_overlay, (0, 0))
     
     # 붉은 비상등 효과 (더 사실적)
+    lights = []
     for i in range(4):
         x = 150 + i * 250
         y = 80
@@ -147,15 +151,11 @@ def create_lobby():
         # 비상등 본체
         draw.rectangle([x-15, y-10, x+15, y+10], fill=(30, 0, 0))
         
-        # 빛의 확산 효과
-        for j in range(8):
-            radius = j * 15
-            alpha = 50 - j * 5
-            if alpha > 0:
-                light_overlay = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 0))
-                light_draw = ImageDraw.Draw(light_overlay)
-                light_draw.ellipse([x-radius, y-radius, x+radius, y+radius], fill=(80, 0, 0, alpha))
-                img = Image.alpha_composite(img.convert('RGBA'), light_overlay).convert('RGB')
+        # 빛의 확산 효과 (반경 15px 간격 고리 8개, 알파 50부터 5씩 감소)
+        lights.append(PointLight((x, y), (80, 0, 0), radius=105, alpha=50, rings=8, falloff=5))
+    
+    img = composite_lights(img, lights)
+    draw = ImageDraw.Draw(img)
     
     # 리셉션 데스크 (더 상세하게)
     desk_x = SCREEN_WIDTH//2 - 200
@@ -174,19 +174,19 @@ def create_lobby():
     
     # 먼지 입자 효과 (더 자연스럽게)
     for i in range(200):
-        x = random.randint(0, SCREEN_WIDTH)
-        y = random.randint(0, SCREEN_HEIGHT)
-        size = random.randint(1, 3)
-        color = random.randint(80, 120)
+        x = rng.randint(0, SCREEN_WIDTH)
+        y = rng.randint(0, SCREEN_HEIGHT)
+        size = rng.randint(1, 3)
+        color = rng.randint(80, 120)
         draw.ellipse([x, y, x+size, y+size], fill=(color, color, color))
     
     # 전체적으로 어둡게 조정
     enhancer = ImageEnhance.Brightness(img)
     img = enhancer.enhance(0.6)
     
-    img.save('assets/lobby.jpg', quality=95)
+    return img
 
-def create_corridor():
+def create_corridor(rng=random):
     """복도 - 고품질 긴 복도"""
     img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (20, 20, 20))
     draw = ImageDraw.Draw(img)
@@ -211,7 +211,7 @@ def create_corridor():
             draw.rectangle([x, y, x+tile_width, y+tile_width], fill=base_color)
     
     # 벽 (더 사실적인 텍스처)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-230, 1)
+    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-230, 1, rng=rng)
     wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-230), (25, 25, 25))
     wall_overlay = Image.blend(wall_overlay, wall_noise, 0.2)
     img.paste(wall_overlay, (0, ceiling_height))
@@ -264,174 +264,29 @@ def create_corridor():
     enhancer = ImageEnhance.Brightness(img)
     img = enhancer.enhance(0.7)
     
-    img.save('assets/corridor.jpg', quality=95)
+    return img
 
-def create_security():
-    """보안실 - 고품질 모니터와 장비들"""
-    img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (8, 8, 8))
-    draw = ImageDraw.Draw(img)
-    
-    # 바닥 (카펫 텍스처)
-    carpet_noise = create_noise_texture(SCREEN_WIDTH, 100, 3)
-    carpet_overlay = Image.new('RGB', (SCREEN_WIDTH, 100), (12, 12, 12))
-    carpet_overlay = Image.blend(carpet_overlay, carpet_noise, 0.4)
-    img.paste(carpet_overlay, (0, SCREEN_HEIGHT-100))
-    
-    # 벽 (어두운 패널)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-100, 1)
-    wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-100), (6, 6, 6))
-    wall_overlay = Image.blend(wall_overlay, wall_noise, 0.1)
-    img.paste(wall_overlay, (0, 0))
-    
-    # 모니터들 (더 사실적)
-    for i in range(3):
-        for j in range(2):
-            x = 150 + i * 300
-            y = 100 + j * 250
-            
-            # 모니터 스탠드
-            draw.rectangle([x+80, y+140, x+120, y+160], fill=(20, 20, 20))
-            
-            # 모니터 본체
-            draw.rectangle([x, y, x+200, y+140], fill=(15, 15, 15))
-            
-            # 모니터 화면 (꺼진 상태)
-            screen_noise = create_noise_texture(180, 120, 0.5)
-            screen_overlay = Image.new('RGB', (180, 120), (3, 3, 3))
-            screen_overlay = Image.blend(screen_overlay, screen_noise, 0.3)
-            img.paste(screen_overlay, (x+10, y+10))
-            
-            # 모니터 프레임
-            draw.rectangle([x, y, x+200, y+140], fill=None, outline=(25, 25, 25), width=3)
-    
-    # 영상기록 장치 (테이프 리코더)
-    recorder_x = SCREEN_WIDTH//2
-    recorder_y = SCREEN_HEIGHT - 200
-    
-    # 리코더 본체
-    draw.rectangle([recorder_x-120, recorder_y-60, recorder_x+120, recorder_y+60], fill=(20, 20, 20))
-    
-    # 리코더 패널
-    draw.rectangle([recorder_x-110, recorder_y-50, recorder_x+110, recorder_y+50], fill=(15, 15, 15))
-    
-    # 테이프 슬롯
-    draw.rectangle([recorder_x-100, recorder_y-30, recorder_x-20, recorder_y+30], fill=(5, 5, 5))
-    
-    # 버튼들
-    for i in range(5):
-        btn_x = recorder_x - 80 + i * 30
-        draw.ellipse([btn_x-8, recorder_y-10, btn_x+8, recorder_y+10], fill=(30, 30, 30))
-    
-    # 전선들 (더 자연스럽게)
-    for i in range(6):
-        x = 80 + i * 200
-        # 전선 본체
-        draw.line([(x, 50), (x, SCREEN_HEIGHT-120)], fill=(25, 25, 25), width=4)
-        # 전선 커넥터
-        draw.ellipse([x-5, SCREEN_HEIGHT-130, x+5, SCREEN_HEIGHT-120], fill=(35, 35, 35))
-    
-    # 전체적으로 어둡게 조정
-    enhancer = ImageEnhance.Brightness(img)
-    img = enhancer.enhance(0.5)
-    
-    img.save('assets/security.jpg', quality=95)
+def create_security(rng=random):
+    """보안실 - 고품질 모니터와 장비들 (scenes/security.json)"""
+    return render_room_scene('security', rng)
 
-def create_ward():
-    """병동 병실 - 고품질 병상과 커튼"""
-    img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (12, 12, 12))
-    draw = ImageDraw.Draw(img)
-    
-    # 바닥 (병원 바닥 타일)
-    tile_size = 50
-    for x in range(0, SCREEN_WIDTH, tile_size):
-        for y in range(SCREEN_HEIGHT-100, SCREEN_HEIGHT, tile_size):
-            color = (15, 15, 15) if (x + y) % (tile_size * 2) == 0 else (10, 10, 10)
-            draw.rectangle([x, y, x+tile_size, y+tile_size], fill=color)
-    
-    # 벽 (병원 벽 텍스처)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-100, 1)
-    wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-100), (10, 10, 10))
-    wall_overlay = Image.blend(wall_overlay, wall_noise, 0.15)
-    img.paste(wall_overlay, (0, 0))
-    
-    # 병상들 (더 상세하게)
-    for i in range(3):
-        x = 150 + i * 300
-        y = SCREEN_HEIGHT - 280
-        
-        # 병상 프레임
-        draw.rectangle([x, y, x+220, y+100], fill=(18, 18, 18))
-        
-        # 병상 매트리스
-        draw.rectangle([x+10, y+10, x+210, y+90], fill=(25, 25, 25))
-        
-        # 병상 시트 (주름 효과)
-        for j in range(5):
-            wrinkle_y = y + 15 + j * 15
-            draw.line([(x+15, wrinkle_y), (x+205, wrinkle_y)], fill=(22, 22, 22), width=1)
-        
-        # 베개
-        draw.rectangle([x+20, y+20, x+80, y+50], fill=(20, 20, 20))
-        
-        # 병상 레일
-        draw.rectangle([x, y+40, x+220, y+45], fill=(15, 15, 15))
-    
-    # 커튼들 (더 자연스럽게)
-    for i in range(3):
-        x = 150 + i * 300
-        
-        # 커튼 폴
-        draw.rectangle([x+100, 50, x+120, SCREEN_HEIGHT-280], fill=(35, 35, 35))
-        
-        # 커튼 천 (주름 효과)
-        curtain_width = 80
-        for j in range(8):
-            fold_x = x + 120 + j * 10
-            draw.rectangle([fold_x, 60, fold_x+8, SCREEN_HEIGHT-290], fill=(30, 30, 30))
-            draw.rectangle([fold_x+1, 60, fold_x+7, SCREEN_HEIGHT-290], fill=(25, 25, 25))
-    
-    # 창문 (어두운 밖)
-    window_x = SCREEN_WIDTH - 200
-    draw.rectangle([window_x, 100, window_x+180, SCREEN_HEIGHT-200], fill=(3, 3, 3))
-    
-    # 창문 프레임
-    draw.rectangle([window_x, 100, window_x+180, SCREEN_HEIGHT-200], fill=None, outline=(20, 20, 20), width=3)
-    
-    # 의료 장비들
-    for i in range(2):
-        x = 100 + i * (SCREEN_WIDTH-200)
-        y = SCREEN_HEIGHT - 150
-        
-        # 장비 본체
-        draw.rectangle([x, y, x+100, y+60], fill=(18, 18, 18))
-        
-        # 장비 패널
-        draw.rectangle([x+10, y+10, x+90, y+50], fill=(12, 12, 12))
-        
-        # 버튼들
-        for j in range(3):
-            btn_x = x + 20 + j * 20
-            draw.ellipse([btn_x-3, y+20, btn_x+3, y+26], fill=(25, 25, 25))
-    
-    # 전체적으로 어둡게 조정
-    enhancer = ImageEnhance.Brightness(img)
-    img = enhancer.enhance(0.6)
-    
-    img.save('assets/ward.jpg', quality=95)
+def create_ward(rng=random):
+    """병동 병실 - 고품질 병상과 커튼 (scenes/ward.json)"""
+    return render_room_scene('ward', rng)
 
-def create_operating():
+def create_operating(rng=random):
     """수술실 - 고품질 수술실 장비들"""
     img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (5, 5, 5))
     draw = ImageDraw.Draw(img)
     
     # 바닥 (수술실 바닥)
-    floor_noise = create_noise_texture(SCREEN_WIDTH, 100, 2)
+    floor_noise = create_noise_texture(SCREEN_WIDTH, 100, 2, rng=rng)
     floor_overlay = Image.new('RGB', (SCREEN_WIDTH, 100), (12, 12, 12))
     floor_overlay = Image.blend(floor_overlay, floor_noise, 0.3)
     img.paste(floor_overlay, (0, SCREEN_HEIGHT-100))
     
     # 벽 (수술실 벽)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-100, 1)
+    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-100, 1, rng=rng)
     wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-100), (4, 4, 4))
     wall_overlay = Image.blend(wall_overlay, wall_noise, 0.1)
     img.paste(wall_overlay, (0, 0))
@@ -452,6 +307,7 @@ def create_operating():
         draw.rectangle([leg_x, table_y+90, leg_x+20, table_y+100], fill=(15, 15, 15))
     
     # 작업등들 (더 사실적)
+    lights = []
     for i in range(3):
         x = 200 + i * 300
         y = 80
@@ -462,15 +318,11 @@ def create_operating():
         # 등 본체
         draw.ellipse([x-20, y+10, x+20, y+40], fill=(20, 20, 20))
         
-        # 빛 (더 자연스럽게)
-        for j in range(5):
-            radius = j * 12
-            alpha = 60 - j * 10
-            if alpha > 0:
-                light_overlay = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 0))
-                light_draw = ImageDraw.Draw(light_overlay)
-                light_draw.ellipse([x-radius, y+40-radius, x+radius, y+40+radius], fill=(60, 60, 20, alpha))
-                img = Image.alpha_composite(img.convert('RGBA'), light_overlay).convert('RGB')
+        # 빛 (반경 12px 간격 고리 5개, 알파 60부터 10씩 감소)
+        lights.append(PointLight((x, y+40), (60, 60, 20), radius=48, alpha=60, rings=5, falloff=10))
+    
+    img = composite_lights(img, lights)
+    draw = ImageDraw.Draw(img)
     
     # 수술 도구들
     tools_x = SCREEN_WIDTH//2
@@ -516,15 +368,15 @@ def create_operating():
     enhancer = ImageEnhance.Brightness(img)
     img = enhancer.enhance(0.4)
     
-    img.save('assets/operating.jpg', quality=95)
+    return img
 
-def create_stairs():
+def create_stairs(rng=random):
     """계단실 - 고품질 내려가는 계단"""
     img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (15, 15, 15))
     draw = ImageDraw.Draw(img)
     
     # 벽 (계단실 벽)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT, 1)
+    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT, 1, rng=rng)
     wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (12, 12, 12))
     wall_overlay = Image.blend(wall_overlay, wall_noise, 0.1)
     img.paste(wall_overlay, (0, 0))
@@ -588,112 +440,281 @@ def create_stairs():
     enhancer = ImageEnhance.Brightness(img)
     img = enhancer.enhance(0.6)
     
-    img.save('assets/stairs.jpg', quality=95)
+    return img
 
-def create_morgue():
-    """시체안치실 - 고품질 서랍과 이름표"""
-    img = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT), (3, 3, 3))
-    draw = ImageDraw.Draw(img)
-    
-    # 바닥 (시체안치실 바닥)
-    floor_noise = create_noise_texture(SCREEN_WIDTH, 100, 2)
-    floor_overlay = Image.new('RGB', (SCREEN_WIDTH, 100), (8, 8, 8))
-    floor_overlay = Image.blend(floor_overlay, floor_noise, 0.4)
-    img.paste(floor_overlay, (0, SCREEN_HEIGHT-100))
-    
-    # 벽 (시체안치실 벽)
-    wall_noise = create_noise_texture(SCREEN_WIDTH, SCREEN_HEIGHT-100, 1)
-    wall_overlay = Image.new('RGB', (SCREEN_WIDTH, SCREEN_HEIGHT-100), (2, 2, 2))
-    wall_overlay = Image.blend(wall_overlay, wall_noise, 0.05)
-    img.paste(wall_overlay, (0, 0))
-    
-    # 서랍들 (시체 보관용)
-    for i in range(4):
-        x = 200 + i * 220
-        y = SCREEN_HEIGHT - 320
-        
-        # 서랍 프레임
-        draw.rectangle([x, y, x+180, y+220], fill=(15, 15, 15))
-        
-        # 서랍 본체
-        if i == 1:  # 두 번째 서랍이 열려있음
-            # 열린 서랍
-            draw.rectangle([x+10, y+10, x+170, y+210], fill=(8, 8, 8))
-            # 서랍 내부 (어둡게)
-            draw.rectangle([x+10, y+10, x+90, y+210], fill=(5, 5, 5))
-        else:
-            # 닫힌 서랍
-            draw.rectangle([x+10, y+10, x+170, y+210], fill=(12, 12, 12))
-        
-        # 서랍 손잡이
-        handle_x = x + 160
-        handle_y = y + 110
-        draw.ellipse([handle_x-8, handle_y-8, handle_x+8, handle_y+8], fill=(25, 25, 25))
-    
-    # 이름표들 (떨리는 듯)
-    for i in range(4):
-        x = 200 + i * 220
-        y = SCREEN_HEIGHT - 340
-        
-        # 이름표 프레임
-        draw.rectangle([x+60, y, x+120, y+25], fill=(20, 20, 20))
-        
-        # 이름표 배경
-        draw.rectangle([x+62, y+2, x+118, y+23], fill=(15, 15, 15))
-        
-        # 이름 (흔들리는 효과)
-        offset = (i % 2) * 3
-        draw.text((x+70+offset, y+5), f"환자 {i+1}", fill=(60, 60, 60))
-    
-    # 차가운 공기 효과 (안개)
-    fog = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 0))
-    fog_draw = ImageDraw.Draw(fog)
-    
-    for i in range(20):
-        x = random.randint(0, SCREEN_WIDTH)
-        y = random.randint(100, SCREEN_HEIGHT-200)
-        size = random.randint(80, 200)
-        alpha = random.randint(10, 30)
-        fog_draw.ellipse([x-size//2, y-size//4, x+size//2, y+size//4], fill=(150, 150, 150, alpha))
-    
-    img = Image.alpha_composite(img.convert('RGBA'), fog).convert('RGB')
-    
-    # 어둠 효과
-    dark_overlay = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 120))
-    img = Image.alpha_composite(img.convert('RGBA'), dark_overlay).convert('RGB')
-    
-    # 전체적으로 어둡게 조정
-    enhancer = ImageEnhance.Brightness(img)
-    img = enhancer.enhance(0.3)
-    
-    img.save('assets/morgue.jpg', quality=95)
+def create_morgue(rng=random):
+    """시체안치실 - 고품질 서랍과 이름표 (scenes/morgue.json)"""
+    return render_room_scene('morgue', rng)
+
+# 방 이름 → 배경 생성 함수
+ROOM_BUILDERS = {
+    "exterior": create_exterior,
+    "lobby": create_lobby,
+    "corridor": create_corridor,
+    "security": create_security,
+    "ward": create_ward,
+    "operating": create_operating,
+    "stairs": create_stairs,
+    "morgue": create_morgue,
+}
+
+def _scene_builder(name):
+    def create_scene_room(rng=random):
+        return render_room_scene(name, rng)
+    return create_scene_room
+
+# 코드 없이 장면 파일만 추가된 방도 등록
+for _name in scene.available_scenes():
+    ROOM_BUILDERS.setdefault(_name, _scene_builder(_name))
+
+def size_label(size):
+    return f"{size[0]}x{size[1]}"
+
+def room_output_name(name, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """기본 해상도는 lobby.jpg, 그 외 해상도는 lobby@1920x1080.jpg"""
+    if tuple(size) == (SCREEN_WIDTH, SCREEN_HEIGHT):
+        return f"{name}.jpg"
+    return f"{name}@{size_label(size)}.jpg"
+
+def room_output_path(name, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    return os.path.join(ASSETS_DIR, room_output_name(name, size))
+
+def resize_variant(img, size):
+    """기본 해상도 이미지를 다른 해상도로 리샘플링 (같은 크기면 그대로)"""
+    if img.size == tuple(size):
+        return img
+    return img.resize(tuple(size), Image.LANCZOS)
+
+def room_fingerprint(name, seed, quality, sizes=((SCREEN_WIDTH, SCREEN_HEIGHT),), raw=True):
+    """방 생성 결과에 영향을 주는 입력들의 지문
+
+    생성 함수와 공용 헬퍼의 소스, 장면 파일, 해상도 목록, 시드, 품질, Pillow 버전을 포함한다.
+    """
+    scene_file = scene.scene_path(name)
+    scene_source = ''
+    if os.path.isfile(scene_file):
+        with open(scene_file, 'rb') as f:
+            scene_source = f.read()
+    return fingerprint(
+        inspect.getsource(ROOM_BUILDERS[name]),
+        scene_source,
+        inspect.getsource(scene),
+        inspect.getsource(render_room_scene),
+        inspect.getsource(textures),
+        inspect.getsource(create_gradient_overlay),
+        inspect.getsource(generate_room),
+        inspect.getsource(build_room),
+        inspect.getsource(resize_variant),
+        inspect.getsource(rawimage) if raw else '',
+        inspect.getsource(gradients),
+        inspect.getsource(lighting),
+        (SCREEN_WIDTH, SCREEN_HEIGHT),
+        sorted(tuple(size) for size in sizes),
+        seed,
+        quality,
+        PIL.__version__,
+    )
+
+def generate_room(name, seed=None):
+    """방 하나의 배경을 메모리 위의 RGB 이미지로 생성
+
+    seed를 지정하면 방마다 독립된 난수 생성기를 써서 같은 시드에서 항상 같은 픽셀을 만든다.
+    """
+    rng = random.Random(f"{seed}:{name}") if seed is not None else random.Random()
+    return ROOM_BUILDERS[name](rng)
+
+def room_outputs(name, sizes, raw=True):
+    """방 하나가 만드는 파일 경로 목록 (해상도별 JPEG, 원시 픽셀 컨테이너)"""
+    outputs = []
+    for size in sizes:
+        path = room_output_path(name, size)
+        outputs.append(path)
+        if raw:
+            outputs.append(rawimage.raw_path_for(path))
+    return outputs
+
+def build_room(name, seed=None, quality=JPEG_QUALITY, sizes=((SCREEN_WIDTH, SCREEN_HEIGHT),), raw=True):
+    """방 하나의 배경을 해상도별로 저장하고 (방 이름, 소요 시간)을 반환
+
+    기본 해상도로 한 번만 그린 뒤 나머지 해상도는 리샘플링해서 만든다.
+    raw가 참이면 게임이 디코딩 없이 읽는 .bgra 컨테이너도 함께 저장한다.
+    """
+    start = time.perf_counter()
+    img = generate_room(name, seed)
+    for size in sizes:
+        path = room_output_path(name, size)
+        variant = resize_variant(img, size)
+        variant.save(path, quality=quality)
+        if raw:
+            # JPEG보다 나중에 저장해서 컨테이너가 항상 JPEG보다 새 파일이 되게 함
+            data = variant.convert('RGBA').tobytes('raw', rawimage.PIXEL_FORMAT)
+            rawimage.write_raw_image(rawimage.raw_path_for(path), size[0], size[1], data)
+    return name, time.perf_counter() - start
+
+def resample_room(name, quality=JPEG_QUALITY, sizes=((SCREEN_WIDTH, SCREEN_HEIGHT),), raw=True):
+    """이미 있는 기본 해상도 JPEG에서 나머지 해상도만 리샘플링해 저장 (다시 그리지 않음)"""
+    start = time.perf_counter()
+    with Image.open(room_output_path(name)) as base:
+        img = base.convert('RGB')
+    for size in sizes:
+        if tuple(size) == (SCREEN_WIDTH, SCREEN_HEIGHT):
+            continue
+        path = room_output_path(name, size)
+        variant = resize_variant(img, size)
+        variant.save(path, quality=quality)
+        if raw:
+            data = variant.convert('RGBA').tobytes('raw', rawimage.PIXEL_FORMAT)
+            rawimage.write_raw_image(rawimage.raw_path_for(path), size[0], size[1], data)
+    return name, time.perf_counter() - start
+
+def write_pyramid_manifest(rooms, sizes):
+    """해상도별 에셋 목록 갱신 (내용이 바뀐 경우에만 파일을 씀)
+
+    이번에 만든 해상도만 방의 목록에 더하므로, 일부 방이나 해상도만 다시 만들어도
+    이전에 만든 파일은 목록에 남는다. 'sizes'는 모든 방 목록에 있는 해상도를 합친 것이다.
+    """
+    try:
+        with open(PYRAMID_PATH, 'r', encoding='utf-8') as f:
+            pyramid = json.load(f)
+    except (OSError, ValueError):
+        pyramid = {}
+
+    room_files = {name: dict(files) for name, files in pyramid.get('rooms', {}).items()}
+    for name in rooms:
+        files = room_files.setdefault(name, {})
+        for size in sizes:
+            files[size_label(size)] = room_output_name(name, size)
+
+    # 이전 목록의 순서를 지키고 새 해상도는 뒤에 붙임
+    labels = [size_label(size) for size in pyramid.get('sizes', [])] + [size_label(size) for size in sizes]
+    for files in room_files.values():
+        labels.extend(files)
+    present = {label for files in room_files.values() for label in files}
+    all_sizes = [[int(v) for v in label.split('x')] for label in dict.fromkeys(labels) if label in present]
+
+    updated = {
+        'base': [SCREEN_WIDTH, SCREEN_HEIGHT],
+        'sizes': all_sizes,
+        'rooms': room_files,
+    }
+
+    if updated != pyramid:
+        with open(PYRAMID_PATH, 'w', encoding='utf-8') as f:
+            json.dump(updated, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="폐병원 방탈출 배경 이미지 생성기")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 생성할 작업 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--only", default="",
+                        help="생성할 방 목록 (쉼표로 구분, 예: lobby,morgue)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="난수 시드 (지정하면 같은 시드에서 항상 같은 이미지 생성)")
+    parser.add_argument("--quality", type=int, default=JPEG_QUALITY,
+                        help=f"JPEG 저장 품질 (기본: {JPEG_QUALITY})")
+    parser.add_argument("--force", action="store_true",
+                        help="변경 여부와 관계없이 모든 방을 다시 생성")
+    parser.add_argument("--no-raw", dest="raw", action="store_false",
+                        help="원시 픽셀 컨테이너(.bgra)를 만들지 않음")
+    parser.add_argument("--resample-existing", action="store_true",
+                        help="방을 다시 그리지 않고 assets의 기본 해상도 JPEG에서 다른 해상도 파일만 만듦")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"함께 생성할 해상도 목록 (기본: {DEFAULT_SIZES}, {SCREEN_WIDTH}x{SCREEN_HEIGHT}은 항상 포함)")
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs는 1 이상이어야 합니다")
+
+    sizes = [(SCREEN_WIDTH, SCREEN_HEIGHT)]
+    for text in args.sizes.split(","):
+        if not text.strip():
+            continue
+        try:
+            width, height = (int(v) for v in text.lower().split("x"))
+        except ValueError:
+            parser.error(f"잘못된 해상도: {text} (예: 1920x1080)")
+        if width < 1 or height < 1:
+            parser.error(f"잘못된 해상도: {text}")
+        if (width, height) not in sizes:
+            sizes.append((width, height))
+    args.sizes = sizes
+
+    if args.only:
+        rooms = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in rooms if name not in ROOM_BUILDERS]
+        if unknown:
+            parser.error(f"알 수 없는 방: {', '.join(unknown)} (가능한 값: {', '.join(ROOM_BUILDERS)})")
+        args.rooms = list(dict.fromkeys(rooms))
+    else:
+        args.rooms = list(ROOM_BUILDERS)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+
+    if args.resample_existing:
+        # 저장소에 들어 있는 배경을 그대로 두고 해상도별 파일과 목록만 다시 만듦
+        for name in args.rooms:
+            name, elapsed = resample_room(name, args.quality, args.sizes, args.raw)
+            print(f"✓ {name} 해상도별 파일 생성 완료 ({elapsed:.2f}초)")
+        write_pyramid_manifest(args.rooms, args.sizes)
+        return
 
-if __name__ == "__main__":
     print("고품질 배경 이미지들을 생성하고 있습니다...")
-    
-    create_exterior()
-    print("✓ exterior.jpg 생성 완료")
-    
-    create_lobby()
-    print("✓ lobby.jpg 생성 완료")
-    
-    create_corridor()
-    print("✓ corridor.jpg 생성 완료")
-    
-    create_security()
-    print("✓ security.jpg 생성 완료")
-    
-    create_ward()
-    print("✓ ward.jpg 생성 완료")
-    
-    create_operating()
-    print("✓ operating.jpg 생성 완료")
-    
-    create_stairs()
-    print("✓ stairs.jpg 생성 완료")
-    
-    create_morgue()
-    print("✓ morgue.jpg 생성 완료")
-    
+    start = time.perf_counter()
+    timings = {}
+
+    # 입력이 바뀌지 않았고 출력 파일도 그대로인 방은 건너뜀
+    manifest = BuildManifest(MANIFEST_PATH)
+    fingerprints = {name: room_fingerprint(name, args.seed, args.quality, args.sizes, args.raw)
+                    for name in args.rooms}
+    outputs = {name: room_outputs(name, args.sizes, args.raw) for name in args.rooms}
+    pending = []
+    for name in args.rooms:
+        if not args.force and manifest.is_up_to_date(name, fingerprints[name], outputs[name]):
+            print(f"- {name}.jpg 변경 없음 (건너뜀)")
+        else:
+            pending.append(name)
+
+    jobs = min(args.jobs, len(pending))
+    if jobs <= 1:
+        for name in pending:
+            name, elapsed = build_room(name, args.seed, args.quality, args.sizes, args.raw)
+            timings[name] = elapsed
+            print(f"✓ {name}.jpg 생성 완료 ({elapsed:.2f}초)")
+    else:
+        # 방마다 독립적이므로 프로세스 풀에 나눠서 생성
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(build_room, name, args.seed, args.quality, args.sizes, args.raw)
+                       for name in pending]
+            for future in as_completed(futures):
+                name, elapsed = future.result()
+                timings[name] = elapsed
+                print(f"✓ {name}.jpg 생성 완료 ({elapsed:.2f}초)")
+
+    if pending:
+        for name in pending:
+            manifest.record(name, fingerprints[name], outputs[name])
+        manifest.save()
+    write_pyramid_manifest(args.rooms, args.sizes)
+
+    total = time.perf_counter() - start
+
+    print("\n생성 시간 요약:")
+    for name in args.rooms:
+        if name in timings:
+            print(f"  {name:<10} {timings[name]:6.2f}초")
+        else:
+            print(f"  {name:<10} {'건너뜀':>6}")
+    print(f"  {'합계':<10} {sum(timings.values()):6.2f}초 (작업 {max(jobs, 1)}개, 실제 경과 {total:.2f}초)")
+
+    if not pending:
+        print("\n모든 배경 이미지가 이미 최신 상태입니다.")
+        return
+
     print("\n모든 고품질 배경 이미지가 assets 폴더에 생성되었습니다!")
     print("이제 게임을 실행하면 더 사실적이고 공포 분위기의 배경 이미지가 표시됩니다.")
+
+if __name__ == "__main__":
+    main()
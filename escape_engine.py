@@ -0,0 +1,490 @@
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 방탈출 게임 로직 (pygame 없이 동작)
+# 방, 아이템, 퍼즐 상태와 이동/획득/사용/상호작용 규칙만 담고 있고,
+# 메시지는 on_message 콜백으로 내보낸다. 화면은 main.EscapeRoom이 맡는다.
+#
+# 게임 내용은 콘텐츠 파일(JSON)에서 읽는다. 상호작용과 아이템 사용은 규칙으로 적고,
+# 읽을 때 (방, 행동) → 규칙 사전으로 컴파일해 두어 클릭마다 바로 찾는다.
+#
+#   {"room": "security", "action": "모니터 켜기", "cases": [
+#     {"if": {"has": "전지"}, "do": [{"set": {"security_monitor": true}}, {"message": "..."}]},
+#     {"do": [{"message": "전지가 필요하다."}]}
+#   ]}
+#
+# 아이템 사용은 "action" 대신 "item"을 쓴다. "room"이 "*"인 규칙은 그 방 전용 규칙이
+# 없을 때 어느 방에서나 쓰인다. cases는 위에서부터 조건(if)을 모두 만족하는 첫 경우 하나만 실행한다.
+#
+# 조건 (값은 이름 하나 또는 목록):
+#   has / lacks            인벤토리에 아이템이 있음 / 없음
+#   puzzle / not_puzzle    퍼즐 상태가 참 / 거짓
+#   room_has / room_lacks  현재 방에 주울 수 있는 아이템이 있음 / 없음
+# 효과 (순서대로 실행):
+#   {"message": "...", "duration": 초}
+#   {"set": {"퍼즐": true}}
+#   {"remove_item": "아이템"}                        인벤토리에서 뺌
+#   {"give_item": "아이템", "success": [...], "full": [...]}  인벤토리에 넣음
+#   {"take_item": "아이템", "success": [...], "full": [...]}  현재 방에서 집어 인벤토리에 넣음
+#   {"set_exits": ["방", ...], "room": "방"}         출구 변경 (room을 빼면 현재 방)
+#   {"move": "방"}                                   이동 (입장 조건 확인)
+#   {"escape": true}                                 탈출 성공
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+DEFAULT_CONTENT = os.path.join(CONTENT_DIR, "hospital.json")
+
+# 어느 방에서나 적용되는 규칙의 방 이름
+ANY_ROOM = "*"
+
+# 조건 → (확인할 곳, 기대 값)
+CONDITIONS = {
+    "has": ("inventory", True),
+    "lacks": ("inventory", False),
+    "puzzle": ("puzzle", True),
+    "not_puzzle": ("puzzle", False),
+    "room_has": ("room", True),
+    "room_lacks": ("room", False),
+}
+
+# 행동 종류 → 처리 메서드 이름 (행동은 (종류, 대상) 튜플)
+ACTIONS = {
+    "interact": "interact",
+    "collect": "collect_item",
+    "move": "move_to_room",
+    "use": "use_item",
+}
+
+# 저장 스냅샷 형식 버전 (형식이 바뀌면 올림)
+SAVE_VERSION = 1
+
+# 엔진이 만드는 게임 상태
+GAME_STATES = ("playing", "escaped", "game_over")
+
+# 엔진이 쓰는 기본 메시지 → 메시지에 넣어 주는 값
+REQUIRED_MESSAGES = {
+    "arrived": ("room",),
+    "collected": ("item",),
+    "inventory_full": (),
+    "no_item": (),
+    "cannot_use": ("item",),
+    "no_interaction": (),
+}
+
+# 방마다 있어야 하는 항목
+ROOM_FIELDS = ("name", "description", "items", "interactions", "exits")
+
+class ContentError(ValueError):
+    """콘텐츠 파일 형식 오류"""
+
+class SaveError(ValueError):
+    """저장 스냅샷을 불러올 수 없음 (버전이 다르거나 콘텐츠와 맞지 않음)"""
+
+class Item:
+    __slots__ = ("name", "description", "image_key", "used")
+
+    def __init__(self, name: str, description: str, image_key: str = None):
+        self.name = name
+        self.description = description
+        self.image_key = image_key
+        self.used = False
+
+class Inventory:
+    """넣은 순서를 지키는 인벤토리
+
+    칸 번호 → 아이템 사전과 이름 → 칸 번호 색인을 함께 두어
+    확인, 제거, 사용이 아이템 수와 상관없이 바로 끝난다.
+    """
+
+    def __init__(self, max_items: int = 8):
+        self.max_items = max_items
+        self._slots: Dict[int, Item] = {}  # 칸 번호 → 아이템 (넣은 순서)
+        self._index: Dict[str, List[int]] = {}  # 이름 → 칸 번호 (같은 이름이 여럿일 수 있음)
+        self._next_slot = 0
+        self._ordered: Optional[List[Item]] = None
+
+    @property
+    def items(self) -> List[Item]:
+        """표시할 순서대로의 아이템 목록"""
+        if self._ordered is None:
+            self._ordered = list(self._slots.values())
+        return self._ordered
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add_item(self, item: Item) -> bool:
+        if len(self._slots) >= self.max_items:
+            return False
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[slot] = item
+        self._index.setdefault(item.name, []).append(slot)
+        self._ordered = None
+        return True
+
+    def remove_item(self, item_name: str) -> Optional[Item]:
+        slots = self._index.get(item_name)
+        if not slots:
+            return None
+        slot = slots.pop(0)
+        if not slots:
+            del self._index[item_name]
+        self._ordered = None
+        return self._slots.pop(slot)
+
+    def has_item(self, item_name: str) -> bool:
+        return item_name in self._index
+
+    def use_item(self, item_name: str) -> bool:
+        for slot in self._index.get(item_name, ()):
+            item = self._slots[slot]
+            if not item.used:
+                item.used = True
+                return True
+        return False
+
+class Content:
+    """컴파일된 게임 콘텐츠 (여러 엔진이 함께 쓰므로 바꾸지 않음)"""
+
+    def __init__(self, data: dict):
+        self.start_room = data.get("start_room", "exterior")
+        try:
+            self.inventory_size = int(data.get("inventory_size", 8))
+        except (TypeError, ValueError) as e:
+            raise ContentError(f"inventory_size가 정수가 아닙니다: {data.get('inventory_size')!r}") from e
+        self.messages: Dict[str, str] = data.get("messages", {})
+        self.items: Dict[str, str] = data.get("items", {})
+        self.rooms: Dict[str, dict] = data.get("rooms", {})
+        self.puzzles: Dict[str, bool] = data.get("puzzles", {})
+        self.puzzle_names = tuple(self.puzzles)  # 저장할 때 퍼즐 비트 순서
+        if self.start_room not in self.rooms:
+            raise ContentError(f"시작 방이 없습니다: {self.start_room}")
+        if self.inventory_size < 1:
+            raise ContentError(f"inventory_size는 1 이상이어야 합니다: {self.inventory_size}")
+        self._check_messages()
+        self._check_rooms()
+
+        self.interactions = self._compile_rules(data.get("interactions", []), "action")
+        self.item_uses = self._compile_rules(data.get("item_uses", []), "item")
+
+        # 방의 상호작용 버튼은 모두 규칙이 있어야 함 (없으면 누를 때마다 no_interaction)
+        for key, room in self.rooms.items():
+            for action in room["interactions"]:
+                if (key, action) not in self.interactions and (ANY_ROOM, action) not in self.interactions:
+                    raise ContentError(f"{key}/{action}: 상호작용 규칙이 없습니다")
+
+    def message(self, key: str, **values) -> str:
+        return self.messages[key].format(**values)
+
+    def _check_messages(self):
+        for key, fields in REQUIRED_MESSAGES.items():
+            if key not in self.messages:
+                raise ContentError(f"messages: '{key}' 메시지가 없습니다")
+            try:
+                self.messages[key].format(**{field: field for field in fields})
+            except (KeyError, IndexError, ValueError) as e:
+                raise ContentError(f"messages/{key}: 잘못된 자리 표시자: {e}") from e
+
+    def _check_rooms(self):
+        for key, room in self.rooms.items():
+            where = f"rooms/{key}"
+            for field in ROOM_FIELDS:
+                if field not in room:
+                    raise ContentError(f"{where}: '{field}' 항목이 없습니다")
+            for item in room["items"]:
+                self._check_name(item, self.items, "아이템", f"{where}/items")
+            for exit_room in room["exits"]:
+                self._check_name(exit_room, self.rooms, "방", f"{where}/exits")
+            for item in room.get("requires", {}):
+                self._check_name(item, self.items, "아이템", f"{where}/requires")
+
+    def _compile_rules(self, rules: list, action_key: str) -> Dict[Tuple[str, str], tuple]:
+        table = {}
+        for rule in rules:
+            room = rule.get("room", ANY_ROOM)
+            action = rule.get(action_key)
+            where = f"{room}/{action}"
+            if action is None:
+                raise ContentError(f"{where}: '{action_key}' 항목이 없습니다")
+            if room != ANY_ROOM:
+                self._check_name(room, self.rooms, "방", where)
+            if action_key == "item":
+                self._check_name(action, self.items, "아이템", where)
+            if (room, action) in table:
+                raise ContentError(f"{where}: 규칙이 두 번 정의되었습니다")
+            cases = rule.get("cases")
+            if not cases:
+                raise ContentError(f"{where}: cases가 비어 있습니다")
+            table[(room, action)] = tuple(self._compile_case(case, where) for case in cases)
+        return table
+
+    def _compile_case(self, case: dict, where: str) -> tuple:
+        conditions = []
+        for kind, names in case.get("if", {}).items():
+            if kind not in CONDITIONS:
+                raise ContentError(f"{where}: 알 수 없는 조건: {kind}")
+            source, wanted = CONDITIONS[kind]
+            known = self.puzzles if source == "puzzle" else self.items
+            # 이름마다 (확인할 곳, 이름, 기대 값) 하나씩으로 펼침
+            for name in ((names,) if isinstance(names, str) else names):
+                self._check_name(name, known, "퍼즐" if source == "puzzle" else "아이템", where)
+                conditions.append((source, name, wanted))
+        return tuple(conditions), self._compile_effects(case.get("do", []), where)
+
+    def _compile_effects(self, effects: list, where: str) -> tuple:
+        compiled = []
+        for effect in effects:
+            if "message" in effect:
+                compiled.append(("message", effect["message"], float(effect.get("duration", 2.0))))
+            elif "set" in effect:
+                for name in effect["set"]:
+                    self._check_name(name, self.puzzles, "퍼즐", where)
+                compiled.append(("set", tuple((name, bool(value)) for name, value in effect["set"].items())))
+            elif "remove_item" in effect:
+                self._check_name(effect["remove_item"], self.items, "아이템", where)
+                compiled.append(("remove_item", effect["remove_item"]))
+            elif "give_item" in effect or "take_item" in effect:
+                kind = "give_item" if "give_item" in effect else "take_item"
+                self._check_name(effect[kind], self.items, "아이템", where)
+                compiled.append((kind, effect[kind], self._compile_effects(effect.get("success", []), where),
+                                 self._compile_effects(effect.get("full", []), where)))
+            elif "set_exits" in effect:
+                room = effect.get("room")
+                for name in ([room] if room else []) + list(effect["set_exits"]):
+                    self._check_name(name, self.rooms, "방", where)
+                compiled.append(("set_exits", room, tuple(effect["set_exits"])))
+            elif "move" in effect:
+                self._check_name(effect["move"], self.rooms, "방", where)
+                compiled.append(("move", effect["move"]))
+            elif "escape" in effect:
+                compiled.append(("escape",))
+            else:
+                raise ContentError(f"{where}: 알 수 없는 효과: {effect}")
+        return tuple(compiled)
+
+    @staticmethod
+    def _check_name(name: str, known: dict, kind: str, where: str):
+        if name not in known:
+            raise ContentError(f"{where}: 알 수 없는 {kind}: {name}")
+
+@lru_cache(maxsize=None)
+def load_content(path: str = DEFAULT_CONTENT) -> Content:
+    """콘텐츠 파일을 읽어 컴파일 (같은 파일은 한 번만 읽음)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return Content(json.load(f))
+
+class EscapeEngine:
+    def __init__(self, on_message: Optional[Callable[[str, float], None]] = None,
+                 content: Optional[Content] = None):
+        self.content = content or load_content()
+        self.on_message = on_message
+        self.reset()
+
+    def reset(self):
+        """콘텐츠의 처음 상태로 되돌림"""
+        self.current_room = self.content.start_room
+        self.inventory = Inventory(self.content.inventory_size)
+        self.game_state = "playing"  # playing, escaped, game_over
+        self.last_message = ""
+
+        # 아이템, 방, 퍼즐 상태 (방의 아이템과 출구 목록은 게임 중에 바뀌므로 복사)
+        self.items = {name: Item(name, description) for name, description in self.content.items.items()}
+        self.rooms = {
+            key: dict(room, items=list(room["items"]), interactions=list(room["interactions"]),
+                      exits=list(room["exits"]))
+            for key, room in self.content.rooms.items()
+        }
+        self.puzzles = dict(self.content.puzzles)
+
+    def snapshot(self) -> dict:
+        """지금 상태를 저장용 사전으로 (처음 상태와 달라진 부분만 담음)
+
+        {"v": 버전, "room": 현재 방, "inv": [아이템, ...], "p": 퍼즐 비트,
+         "rooms": {방: {"items": [...], "exits": [...]}}, "used": [...], "state": ...}
+        rooms에는 바뀐 방의 바뀐 목록만, used와 state는 처음과 다를 때만 들어간다.
+        """
+        puzzles = self.puzzles
+        bits = 0
+        for i, name in enumerate(self.content.puzzle_names):
+            if puzzles[name]:
+                bits |= 1 << i
+
+        rooms = {}
+        for key, initial in self.content.rooms.items():
+            room = self.rooms[key]
+            changed = {field: room[field] for field in ("items", "exits") if room[field] != initial[field]}
+            if changed:
+                rooms[key] = changed
+
+        items = self.inventory.items
+        snapshot = {"v": SAVE_VERSION, "room": self.current_room, "inv": [item.name for item in items],
+                    "p": bits}
+        if rooms:
+            snapshot["rooms"] = rooms
+        used = [item.name for item in items if item.used]
+        if used:
+            snapshot["used"] = used
+        if self.game_state != "playing":
+            snapshot["state"] = self.game_state
+        return snapshot
+
+    def restore(self, snapshot: dict):
+        """snapshot()으로 만든 상태를 불러옴 (메시지는 보내지 않고, 실패하면 처음 상태로 남음)"""
+        self.reset()
+        if not isinstance(snapshot, dict) or snapshot.get("v") != SAVE_VERSION:
+            raise SaveError("저장 형식 버전이 다릅니다")
+        try:
+            room = snapshot["room"]
+            if room not in self.rooms:
+                raise SaveError(f"알 수 없는 방: {room}")
+            self.current_room = room
+
+            for name in snapshot["inv"]:
+                if name not in self.items:
+                    raise SaveError(f"알 수 없는 아이템: {name}")
+                if not self.inventory.add_item(self.items[name]):
+                    raise SaveError("인벤토리 크기를 넘습니다")
+            for name in snapshot.get("used", ()):
+                self.items[name].used = True
+
+            bits = int(snapshot["p"])
+            names = self.content.puzzle_names
+            if bits >> len(names):
+                raise SaveError("퍼즐 상태가 콘텐츠와 맞지 않습니다")
+            for i, name in enumerate(names):
+                self.puzzles[name] = bool(bits >> i & 1)
+
+            for key, changed in snapshot.get("rooms", {}).items():
+                for field, values in changed.items():
+                    known = {"items": self.items, "exits": self.rooms}.get(field)
+                    if known is None or any(value not in known for value in values):
+                        raise SaveError(f"방 상태가 콘텐츠와 맞지 않습니다: {key}/{field}")
+                    self.rooms[key][field] = list(values)
+
+            game_state = snapshot.get("state", "playing")
+            if game_state not in GAME_STATES:
+                raise SaveError(f"알 수 없는 게임 상태: {game_state}")
+            self.game_state = game_state
+        except SaveError:
+            self.reset()
+            raise
+        except (KeyError, TypeError, ValueError) as e:
+            self.reset()
+            raise SaveError(f"저장 스냅샷을 읽을 수 없습니다: {e!r}") from e
+
+    def notify(self, message: str, duration: float = 2.0):
+        """메시지를 알림 (duration은 화면에 표시할 시간, 초)"""
+        self.last_message = message
+        if self.on_message is not None:
+            self.on_message(message, duration)
+
+    def actions(self) -> List[Tuple[str, str]]:
+        """지금 할 수 있는 행동 목록 (화면의 버튼과 인벤토리 줄에 해당)"""
+        room = self.rooms[self.current_room]
+        actions = [("interact", name) for name in room["interactions"]]
+        actions += [("collect", name) for name in room["items"]]
+        actions += [("move", name) for name in room["exits"]]
+        actions += [("use", item.name) for item in self.inventory.items]
+        return actions
+
+    def perform(self, action: Tuple[str, str]):
+        """(종류, 대상) 행동 실행"""
+        kind, target = action
+        if kind not in ACTIONS:
+            raise ValueError(f"알 수 없는 행동: {kind}")
+        getattr(self, ACTIONS[kind])(target)
+
+    def can_enter_room(self, room_name: str) -> tuple[bool, str]:
+        room = self.rooms[room_name]
+        if "requires" in room:
+            for item, message in room["requires"].items():
+                if not self.inventory.has_item(item):
+                    return False, message
+        return True, ""
+
+    def move_to_room(self, room_name: str):
+        can_enter, message = self.can_enter_room(room_name)
+        if can_enter:
+            self.current_room = room_name
+            self.notify(self.content.message("arrived", room=self.rooms[room_name]["name"]))
+        else:
+            self.notify(message)
+
+    def collect_item(self, item_name: str):
+        if item_name in self.items and item_name in self.rooms[self.current_room]["items"]:
+            if self.inventory.add_item(self.items[item_name]):
+                self.rooms[self.current_room]["items"].remove(item_name)
+                self.notify(self.content.message("collected", item=item_name))
+            else:
+                self.notify(self.content.message("inventory_full"))
+        else:
+            self.notify(self.content.message("no_item"))
+
+    def use_item(self, item_name: str):
+        if not self.inventory.has_item(item_name):
+            self.notify(self.content.message("no_item"))
+            return
+
+        cases = self.find_rule(self.content.item_uses, item_name)
+        if cases is None:
+            self.notify(self.content.message("cannot_use", item=item_name))
+        else:
+            self.run_rule(cases)
+
+    def interact(self, interaction: str):
+        cases = self.find_rule(self.content.interactions, interaction)
+        if cases is None:
+            self.notify(self.content.message("no_interaction"))
+        else:
+            self.run_rule(cases)
+
+    def find_rule(self, table: dict, action: str) -> Optional[tuple]:
+        """현재 방의 규칙, 없으면 어느 방에나 적용되는 규칙"""
+        cases = table.get((self.current_room, action))
+        if cases is None:
+            cases = table.get((ANY_ROOM, action))
+        return cases
+
+    def run_rule(self, cases: tuple):
+        """조건을 모두 만족하는 첫 경우의 효과를 실행"""
+        for conditions, effects in cases:
+            for source, name, wanted in conditions:
+                if source == "puzzle":
+                    value = self.puzzles[name]
+                elif source == "inventory":
+                    value = self.inventory.has_item(name)
+                else:
+                    value = name in self.rooms[self.current_room]["items"]
+                if value != wanted:
+                    break
+            else:
+                self._apply(effects)
+                return
+
+    def _apply(self, effects: tuple):
+        for effect in effects:
+            kind = effect[0]
+            if kind == "message":
+                self.notify(effect[1], effect[2])
+            elif kind == "set":
+                for name, value in effect[1]:
+                    self.puzzles[name] = value
+            elif kind == "remove_item":
+                self.inventory.remove_item(effect[1])
+            elif kind in ("give_item", "take_item"):
+                _, name, success, full = effect
+                if self.inventory.add_item(self.items[name]):
+                    if kind == "take_item":
+                        self.rooms[self.current_room]["items"].remove(name)
+                    self._apply(success)
+                else:
+                    self._apply(full)
+            elif kind == "set_exits":
+                _, room, exits = effect
+                self.rooms[room or self.current_room]["exits"] = list(exits)
+            elif kind == "move":
+                self.move_to_room(effect[1])
+            elif kind == "escape":
+                self.game_state = "escaped"
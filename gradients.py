@@ -0,0 +1,80 @@
+import math
+
+from PIL import Image
+
+# 그라데이션 생성 모듈
+# 모든 그라데이션은 한 줄(또는 한 장의 작은 마스크)만 계산한 뒤
+# 리사이즈/룩업 테이블로 전체 이미지를 한 번에 만든다.
+
+# Image.radial_gradient 마스크에서 가장자리 중앙(반지름 128)의 값
+_RADIAL_EDGE = 128 * math.sqrt(2)
+
+def _normalize_stops(stops):
+    """(위치, 색상) 목록을 위치 순으로 정렬하고 양 끝을 채움"""
+    stops = sorted(((float(pos), tuple(color)) for pos, color in stops), key=lambda s: s[0])
+    if not stops:
+        raise ValueError("그라데이션에는 최소 하나의 색상 지점이 필요합니다")
+    if stops[0][0] > 0.0:
+        stops.insert(0, (0.0, stops[0][1]))
+    if stops[-1][0] < 1.0:
+        stops.append((1.0, stops[-1][1]))
+    return stops
+
+def _interpolate(stops, ratio):
+    """정규화된 색상 지점 목록에서 ratio 위치의 RGB 계산"""
+    for (pos1, color1), (pos2, color2) in zip(stops, stops[1:]):
+        if ratio <= pos2 or pos2 >= 1.0:
+            t = (ratio - pos1) / (pos2 - pos1) if pos2 > pos1 else 0.0
+            t = min(max(t, 0.0), 1.0)
+            return tuple(int(c1 * (1 - t) + c2 * t) for c1, c2 in zip(color1, color2))
+    return stops[-1][1]
+
+def _strip(length, stops):
+    """길이만큼의 색상 띠 바이트 생성 (i / length 위치에서 샘플링)"""
+    data = bytearray()
+    for i in range(length):
+        data.extend(_interpolate(stops, i / length))
+    return bytes(data)
+
+def _lut(stops):
+    """0~255 마스크 값을 색상으로 바꾸는 채널별 룩업 테이블"""
+    colors = [_interpolate(stops, v / 255) for v in range(256)]
+    return [[color[band] for color in colors] for band in range(3)]
+
+def colorize(mask, stops):
+    """'L' 마스크를 색상 지점에 따라 RGB로 변환"""
+    stops = _normalize_stops(stops)
+    luts = _lut(stops)
+    return Image.merge('RGB', [mask.point(lut) for lut in luts])
+
+def multi_stop_gradient(width, height, stops, direction='vertical'):
+    """여러 색상 지점을 가진 선형 그라데이션"""
+    stops = _normalize_stops(stops)
+    if direction == 'vertical':
+        strip = Image.frombytes('RGB', (1, height), _strip(height, stops))
+    else:
+        strip = Image.frombytes('RGB', (width, 1), _strip(width, stops))
+    return strip.resize((width, height), Image.NEAREST)
+
+def linear_gradient(width, height, color1, color2, direction='vertical'):
+    """두 색상 사이의 선형 그라데이션 (기존 줄 단위 출력과 동일)"""
+    return multi_stop_gradient(width, height, [(0.0, color1), (1.0, color2)], direction)
+
+def radial_gradient(width, height, stops, center=None, radius=None):
+    """중심에서 바깥으로 퍼지는 원형 그라데이션
+
+    stops의 위치 0.0은 중심, 1.0은 radius 거리이며 그 바깥은 마지막 색상으로 채운다.
+    """
+    if center is None:
+        center = (width // 2, height // 2)
+    if radius is None:
+        radius = max(width, height) // 2
+    radius = max(int(radius), 1)
+
+    # Pillow 내장 원형 마스크(256x256, 값 = 중심 거리 x √2)를 확대한 뒤
+    # radius 거리에서 255가 되도록 값 범위를 늘려서 사용
+    mask = Image.new('L', (width, height), 255)
+    disc = Image.radial_gradient('L').resize((radius * 2, radius * 2), Image.BILINEAR)
+    disc = disc.point(lambda v: min(255, round(v * 255 / _RADIAL_EDGE)))
+    mask.paste(disc, (center[0] - radius, center[1] - radius))
+    return colorize(mask, stops)
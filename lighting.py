@@ -0,0 +1,79 @@
+from PIL import Image, ImageDraw
+
+# 점광원 블룸 합성 모듈
+# 각 광원의 동심원 고리를 광원 크기만큼의 작은 마스크에 한 번에 그리고,
+# 모든 광원을 하나의 누적 버퍼에 모은 뒤 배경과 한 번만 합성한다.
+
+class PointLight:
+    """점광원 (위치, 색상, 반경, 감쇠)
+
+    rings개의 동심원 고리가 중심(반경 0)부터 radius까지 같은 간격으로 놓이며,
+    j번째 고리의 알파는 alpha - falloff * j 이다. 알파가 0 이하인 고리는 그리지 않는다.
+    """
+
+    def __init__(self, position, color, radius, alpha=50, rings=8, falloff=None):
+        self.position = (int(position[0]), int(position[1]))
+        self.color = tuple(color[:3])
+        self.radius = int(radius)
+        self.alpha = alpha
+        self.rings = max(int(rings), 1)
+        # 감쇠를 지정하지 않으면 마지막 고리에서 0이 되도록 선형 감소
+        self.falloff = alpha / self.rings if falloff is None else falloff
+
+    def ring_layout(self):
+        """(고리 반경, 고리 알파) 목록"""
+        layout = []
+        for j in range(self.rings):
+            alpha = self.alpha - self.falloff * j
+            if alpha <= 0:
+                continue
+            if self.rings > 1:
+                radius = round(self.radius * j / (self.rings - 1))
+            else:
+                radius = self.radius
+            layout.append((radius, min(alpha, 255)))
+        return layout
+
+    def bounding_box(self):
+        """광원이 영향을 주는 영역 (left, top, right, bottom), 끝 좌표 포함"""
+        x, y = self.position
+        return (x - self.radius, y - self.radius, x + self.radius, y + self.radius)
+
+    def render(self):
+        """광원 영역 크기의 RGBA 패치 생성
+
+        고리를 하나씩 합성했을 때의 누적 불투명도 1 - Π(1 - a)를
+        바깥 고리부터 안쪽 고리 순서로 덮어 그려 한 장의 마스크로 만든다.
+        """
+        size = self.radius * 2 + 1
+        transmittance = Image.new('L', (size, size), 255)
+        draw = ImageDraw.Draw(transmittance)
+
+        remaining = 1.0
+        for radius, alpha in reversed(self.ring_layout()):
+            remaining *= 1 - alpha / 255
+            c = self.radius
+            draw.ellipse([c - radius, c - radius, c + radius, c + radius], fill=round(255 * remaining))
+
+        patch = Image.new('RGBA', (size, size), self.color + (0,))
+        patch.putalpha(transmittance.point(lambda v: 255 - v))
+        return patch
+
+def composite_lights(img, lights):
+    """광원 목록의 블룸을 하나의 누적 버퍼에 모아 이미지 위에 한 번 합성"""
+    width, height = img.size
+    accumulation = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+
+    for light in lights:
+        left, top, right, bottom = light.bounding_box()
+        # 화면 밖으로 나간 부분은 잘라서 광원 영역 안에서만 합성
+        clip_left, clip_top = max(left, 0), max(top, 0)
+        clip_right, clip_bottom = min(right + 1, width), min(bottom + 1, height)
+        if clip_left >= clip_right or clip_top >= clip_bottom:
+            continue
+
+        patch = light.render()
+        source = (clip_left - left, clip_top - top, clip_right - left, clip_bottom - top)
+        accumulation.alpha_composite(patch, dest=(clip_left, clip_top), source=source)
+
+    return Image.alpha_composite(img.convert('RGBA'), accumulation).convert('RGB')
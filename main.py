@@ -1,16 +1,24 @@
 import pygame
+import argparse
+import json
 import sys
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import List, Dict, Optional
 
-# Pygame 초기화
-pygame.init()
+import rawimage
+import savegame
+from escape_engine import EscapeEngine
+from profiler import FrameProfiler
+from widgets import Widget, WidgetLayer
 
-# 화면 설정
+# 화면 설정 (창은 init_pygame()에서 만듦)
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("금지 구역 - 폐병원 방탈출")
+screen: Optional[pygame.Surface] = None
 
 # 색상 정의
 BLACK = (0, 0, 0)
@@ -25,68 +33,236 @@ YELLOW = (255, 255, 0)
 # 에셋 폴더
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 
-# 폰트 설정 (한글 지원)
-try:
-    font_large = pygame.font.SysFont('malgun gothic', 48)
-    font_medium = pygame.font.SysFont('malgun gothic', 32)
-    font_small = pygame.font.SysFont('malgun gothic', 24)
-    font_tiny = pygame.font.SysFont('malgun gothic', 18)
-except:
+# 절차적 배경 생성 시드 (같은 시드 → 같은 배경)
+BACKGROUND_SEED = 1973
+
+# 배경 Surface 캐시 기본 용량 (바이트)
+BACKGROUND_CACHE_BYTES = 64 * 1024 * 1024
+
+# 화면이 움직이지 않을 때 이벤트를 기다리는 최대 시간 (초)
+IDLE_TIMEOUT = 1.0
+
+# 배경 미리 읽기가 끝나면 올리는 이벤트 (대기 중인 루프를 깨움)
+BACKGROUND_READY = pygame.USEREVENT + 1
+
+# 프로파일러 오버레이를 다시 그리는 간격 (프레임)
+PROFILER_REFRESH_FRAMES = 15
+
+# 배경 위에 어둠 효과를 덮는 방
+DARK_ROOMS = ("lobby", "operating", "morgue", "ward", "security", "corridor", "stairs")
+
+# 폰트 설정 (한글 지원, 앞쪽 글꼴부터 찾고 없으면 pygame 기본 글꼴)
+FONT_FAMILIES = ("malgun gothic", "gulim", "arial")
+
+# 찾은 글꼴 파일 경로를 실행 사이에 보관하는 파일 (지우면 다시 찾음)
+FONT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".font_cache.json")
+
+_font_path: Optional[str] = None
+_font_path_resolved = False
+
+def resolve_font_path() -> Optional[str]:
+    """FONT_FAMILIES 중 처음 찾은 글꼴 파일 경로
+
+    시스템 글꼴 목록 검색은 느리므로 찾은 경로를 FONT_CACHE_PATH에 저장해 두고 다음 실행에서 재사용한다.
+    찾지 못했으면 저장하지 않으므로 나중에 글꼴을 설치하면 다음 실행에서 다시 찾는다.
+    """
+    global _font_path, _font_path_resolved
+    if _font_path_resolved:
+        return _font_path
+    
     try:
-        font_large = pygame.font.SysFont('gulim', 48)
-        font_medium = pygame.font.SysFont('gulim', 32)
-        font_small = pygame.font.SysFont('gulim', 24)
-        font_tiny = pygame.font.SysFont('gulim', 18)
-    except:
-        font_large = pygame.font.SysFont('arial', 48)
-        font_medium = pygame.font.SysFont('arial', 32)
-        font_small = pygame.font.SysFont('arial', 24)
-        font_tiny = pygame.font.SysFont('arial', 18)
-
-class Item:
-    def __init__(self, name: str, description: str, image_key: str = None):
-        self.name = name
-        self.description = description
-        self.image_key = image_key
-        self.used = False
-
-class Inventory:
-    def __init__(self):
-        self.items: List[Item] = []
-        self.max_items = 8
-        
-    def add_item(self, item: Item) -> bool:
-        if len(self.items) < self.max_items:
-            self.items.append(item)
-            return True
-        return False
-        
-    def remove_item(self, item_name: str) -> Optional[Item]:
-        for i, item in enumerate(self.items):
-            if item.name == item_name:
-                return self.items.pop(i)
+        with open(FONT_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        path = cached.get("path")
+        if cached.get("families") == list(FONT_FAMILIES) and path and os.path.isfile(path):
+            _font_path, _font_path_resolved = path, True
+            return path
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    path = None
+    for family in FONT_FAMILIES:
+        path = pygame.font.match_font(family)
+        if path:
+            break
+    _font_path, _font_path_resolved = path, True
+    if path is None:
         return None
+    
+    try:
+        with open(FONT_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"families": list(FONT_FAMILIES), "path": path}, f, ensure_ascii=False)
+    except OSError:
+        # 설치 폴더에 쓸 수 없으면 캐시 없이 진행
+        pass
+    return path
+
+class LazyFont:
+    """처음 쓸 때 글꼴 파일을 읽는 pygame.font.Font 대리 객체"""
+    
+    def __init__(self, point_size: int):
+        self.point_size = point_size
+        self._font: Optional[pygame.font.Font] = None
+    
+    @property
+    def font(self) -> pygame.font.Font:
+        if self._font is None:
+            self._font = pygame.font.Font(resolve_font_path(), self.point_size)
+        return self._font
+    
+    def __getattr__(self, name):
+        # render, size 등은 실제 글꼴로 넘김
+        return getattr(self.font, name)
+
+font_large = LazyFont(48)
+font_medium = LazyFont(32)
+font_small = LazyFont(24)
+font_tiny = LazyFont(18)
+
+class TextCache:
+    """렌더링한 글자 표면을 (폰트, 글자, 색, 안티앨리어싱) 단위로 보관하는 LRU 캐시
+
+    한글 글꼴 래스터화는 비싸므로 같은 문자열은 한 번만 그리고 재사용한다.
+    돌려준 표면은 여러 곳에서 공유하므로 수정하지 말고 blit만 해야 한다.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        """font.render와 같은 인자로 호출"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
         
-    def has_item(self, item_name: str) -> bool:
-        return any(item.name == item_name for item in self.items)
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        self.entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+text_cache = TextCache()
+
+class SurfaceCache:
+    """바이트 예산 안에서 Surface를 보관하는 LRU 캐시
+
+    예산을 넘으면 가장 오래 쓰지 않은 항목부터 내보낸다. 방금 넣은 항목은
+    예산보다 커도 내보내지 않는다. None(이미지 없음)도 0바이트로 기억한다.
+    """
+    
+    def __init__(self, max_bytes: int = BACKGROUND_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Optional[pygame.Surface]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def surface_bytes(surface: Optional[pygame.Surface]) -> int:
+        if surface is None:
+            return 0
+        return surface.get_pitch() * surface.get_height()
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, key: str) -> Optional[pygame.Surface]:
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+    
+    def put(self, key: str, surface: Optional[pygame.Surface]):
+        if key in self.entries:
+            self.bytes -= self.surface_bytes(self.entries.pop(key))
+        self.entries[key] = surface
+        self.bytes += self.surface_bytes(surface)
         
-    def use_item(self, item_name: str) -> bool:
-        for item in self.items:
-            if item.name == item_name and not item.used:
-                item.used = True
-                return True
-        return False
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+    
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+def _post_background_ready(future: Future):
+    """작업 스레드에서 배경 읽기가 끝났음을 이벤트 루프에 알림
+
+    이벤트 자체는 처리하지 않고, 대기 중인 루프를 깨워 update()가 결과를 받아 가게 한다.
+    """
+    try:
+        pygame.event.post(pygame.event.Event(BACKGROUND_READY))
+    except pygame.error:
+        # 이미 pygame이 종료된 경우
+        pass
+
+def wait_for_events(timeout: Optional[float] = IDLE_TIMEOUT) -> list:
+    """쌓인 이벤트를 모두 가져오고, 없으면 timeout초 동안 다음 이벤트를 기다림
+
+    기다리는 동안은 CPU를 쓰지 않는다. 시간이 다 되면 빈 목록을 돌려준다.
+    """
+    events = pygame.event.get()
+    if events:
+        return events
+    
+    timeout = IDLE_TIMEOUT if timeout is None else min(timeout, IDLE_TIMEOUT)
+    event = pygame.event.wait(max(1, int(timeout * 1000)))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
 class MainMenu:
     def __init__(self):
         self.selected_option = 0
         self.menu_options = ["게임 시작", "게임 종료"]
+        if savegame.has_save():
+            self.menu_options.insert(0, "이어하기")
+        self.widgets = WidgetLayer()
+        self._layout_size = None
+    
+    def layout(self) -> WidgetLayer:
+        """메뉴 항목 위치 (화면 크기가 바뀔 때만 다시 계산)"""
+        if self._layout_size != screen.get_size():
+            widgets = []
+            for i, option in enumerate(self.menu_options):
+                text_rect = pygame.Rect((0, 0), font_medium.size(option))
+                text_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 60)
+                click_rect = text_rect.inflate(100, 20)
+                widgets.append(Widget(click_rect, option, "options", option, text_rect))
+            self.widgets.set_widgets(widgets)
+            self._layout_size = screen.get_size()
+        return self.widgets
         
     def draw(self):
         screen.fill(BLACK)
         
-        title = font_large.render("금지 구역", True, RED)
-        subtitle = font_medium.render("폐병원 방탈출", True, WHITE)
+        title = text_cache.render(font_large, "금지 구역", True, RED)
+        subtitle = text_cache.render(font_medium, "폐병원 방탈출", True, WHITE)
         
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 60))
@@ -94,29 +270,23 @@ class MainMenu:
         screen.blit(title, title_rect)
         screen.blit(subtitle, subtitle_rect)
         
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for i, option in enumerate(self.menu_options):
-            text = font_medium.render(option, True, WHITE)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 60))
-            
-            click_rect = pygame.Rect(text_rect.x - 50, text_rect.y - 10, text_rect.width + 100, text_rect.height + 20)
-            
-            is_hovered = click_rect.collidepoint(mouse_pos)
-            is_selected = i == self.selected_option
+        layer = self.layout()
+        for widget in layer.group("options"):
+            is_hovered = widget is layer.hovered
+            is_selected = widget.index == self.selected_option
             
             if is_hovered or is_selected:
                 color = RED
-                box_rect = pygame.Rect(text_rect.x - 20, text_rect.y - 10, text_rect.width + 40, text_rect.height + 20)
+                box_rect = widget.text_rect.inflate(40, 20)
                 pygame.draw.rect(screen, DARK_RED, box_rect)
                 pygame.draw.rect(screen, RED, box_rect, 3)
             else:
                 color = WHITE
             
-            text = font_medium.render(option, True, color)
-            screen.blit(text, text_rect)
+            text = text_cache.render(font_medium, widget.label, True, color)
+            screen.blit(text, widget.text_rect)
         
-        instruction = font_small.render("방향키 또는 마우스로 선택, Enter 또는 클릭으로 확인", True, GRAY)
+        instruction = text_cache.render(font_small, "방향키 또는 마우스로 선택, Enter 또는 클릭으로 확인", True, GRAY)
         instruction_rect = instruction.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
         screen.blit(instruction, instruction_rect)
     
@@ -128,24 +298,54 @@ class MainMenu:
                 self.selected_option = (self.selected_option + 1) % len(self.menu_options)
             elif event.key == pygame.K_RETURN:
                 return self.menu_options[self.selected_option]
+        elif event.type == pygame.MOUSEMOTION:
+            self.layout().hover(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:
-                mouse_pos = pygame.mouse.get_pos()
-                for i, option in enumerate(self.menu_options):
-                    text = font_medium.render(option, True, WHITE)
-                    text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 60))
-                    click_rect = pygame.Rect(text_rect.x - 50, text_rect.y - 10, text_rect.width + 100, text_rect.height + 20)
-                    if click_rect.collidepoint(mouse_pos):
-                        return option
+                widget = self.layout().hit(event.pos)
+                if widget is not None:
+                    return widget.action
         return None
 
 class EscapeRoom:
-    def __init__(self):
-        self.current_room = "exterior"
-        self.inventory = Inventory()
-        self.game_state = "playing"  # playing, escaped, game_over
+    # 화면 UI 영역 (그리는 순서대로, dirty-rect 렌더링의 단위)
+    UI_REGIONS = ("room_info", "inventory", "interactions", "items", "exits", "message")
+    
+    def __init__(self, procedural_backgrounds: bool = False, background_seed: int = BACKGROUND_SEED,
+                 dirty_rects: bool = True, bg_cache_bytes: int = BACKGROUND_CACHE_BYTES,
+                 profiler: Optional[FrameProfiler] = None, profile_output: Optional[str] = None,
+                 autosave: bool = True, resume: bool = False):
+        # 게임 로직은 엔진이 맡고, 이 클래스는 화면 표시와 입력만 처리
+        self.engine = EscapeEngine(on_message=self.show_message)
         self.message = ""
-        self.message_timer = 0
+        self.message_visible = False
+        self.message_expires = 0.0  # time.monotonic() 기준
+        
+        # 저장 (상태가 바뀌면 AUTOSAVE_INTERVAL 안에 작업 스레드에서 저장)
+        if resume and savegame.load_into(self.engine):
+            self.show_message("저장된 게임을 불러왔다.")
+        self.autosaver = savegame.AutoSaver() if autosave else None
+        self._save_pending = False
+        self._autosave_at = 0.0
+        
+        # dirty-rect 렌더링 상태 (영역별 마지막으로 그린 상태와 범위)
+        self.dirty_rects = dirty_rects
+        self._screen_key = None
+        self._region_states: Dict[str, object] = {}
+        self._region_bounds: Dict[str, Optional[pygame.Rect]] = {}
+        
+        # 프레임 프로파일러 (켜져 있으면 오버레이도 하나의 화면 영역으로 그림)
+        self.profiler = profiler
+        self.profile_output = profile_output
+        self.regions = self.UI_REGIONS + (("profiler",) if profiler else ())
+        
+        # 버튼 위치와 클릭 판정 (상태가 바뀔 때만 다시 계산)
+        self.widgets = WidgetLayer()
+        self._layout_key = None
+        
+        # 배경과 어둠 효과를 미리 합친 표면 (방, 화면 크기)
+        self._backdrop: Optional[pygame.Surface] = None
+        self._backdrop_key = None
         
         # 배경 이미지
         self.backgrounds = {
@@ -159,294 +359,216 @@ class EscapeRoom:
             "stairs": DARK_GRAY
         }
         
-        self.bg_images: Dict[str, Optional[pygame.Surface]] = {}
+        self.procedural_backgrounds = procedural_backgrounds
+        self.background_seed = background_seed
+        
+        # 해상도별 에셋 목록 (화면 크기와 정확히 맞는 파일이 있으면 스케일링 없이 사용)
+        self.asset_variants = self._load_asset_variants()
+        
+        # 배경은 현재 방만 바로 읽고, 이동할 수 있는 방은 작업 스레드에서 미리 읽음
+        self.bg_images = SurfaceCache(bg_cache_bytes)
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bg-prefetch")
+        self._prefetching: Dict[str, Future] = {}
+        self._prefetched_for: Optional[List[str]] = None
+        
+        # 첫 화면에 필요한 현재 방 배경만 바로 읽음
         print("배경 이미지를 로딩하고 있습니다...")
-        for key in self.backgrounds.keys():
-            self.bg_images[key] = self._try_load_bg_image(key)
-            if self.bg_images[key]:
-                print(f"✓ {key}.jpg 로딩 완료")
-            else:
-                print(f"⚠ {key}.jpg 없음 - 색상 배경 사용")
-        print("배경 이미지 로딩 완료!")
-        
-        # 아이템 정의
-        self.items = {
-            "열쇠": Item("열쇠", "낡은 열쇠. 어딘가의 문을 열 수 있을 것 같다."),
-            "전지": Item("전지", "AA 전지. 전자기기에 사용할 수 있다."),
-            "테이프": Item("테이프", "낡은 VHS 테이프. 녹화된 내용이 있을 것 같다."),
-            "의료기록": Item("의료기록", "환자의 의료기록. 중요한 정보가 담겨있다."),
-            "카드키": Item("카드키", "보안 카드키. 특정 문을 열 수 있다."),
-            "지도": Item("지도", "병원 지도. 출구를 찾는 데 도움이 될 것이다."),
-            "손전등": Item("손전등", "휴대용 손전등. 어둠을 밝힐 수 있다."),
-            "비상등": Item("비상등", "비상 탈출구용 등. 탈출할 때 사용한다."),
-            "탈출열쇠": Item("탈출열쇠", "비상 탈출구용 열쇠. 시체안치실에서 사용할 수 있다.")
-        }
+        self._store_bg_image(self.current_room, self._try_load_bg_image(self.current_room))
+        self.prefetch_backgrounds()
         
-        # 방별 설정
-        self.rooms = {
-            "exterior": {
-                "name": "병원 외부",
-                "description": "버려진 병원 앞. 차가운 바람이 휘돈다. 정문이 잠겨있다.",
-                "items": ["열쇠"],
-                "interactions": ["정문 열기"],
-                "exits": []
-            },
-            "lobby": {
-                "name": "로비",
-                "description": "로비에는 먼지 냄새와 곰팡이 냄새가 섞여 있다. 붉은 비상등이 깜빡인다.",
-                "items": ["지도"],
-                "interactions": ["비상등 확인"],
-                "exits": ["corridor", "security"]
-            },
-            "corridor": {
-                "name": "복도",
-                "description": "긴 복도 끝에서 금속이 끄는 소리가 들린다. 휠체어가 혼자 움직이는 듯 흔들린다.",
-                "items": [],
-                "interactions": ["휠체어 확인"],
-                "exits": ["lobby", "ward", "operating", "stairs"]
-            },
-            "security": {
-                "name": "보안실",
-                "description": "보안실. 꺼진 모니터가 줄지어 있고, 낡은 영상기록 장치가 덩그러니 놓여 있다.",
-                "items": ["테이프"],
-                "interactions": ["모니터 켜기", "테이프 재생"],
-                "exits": ["lobby"],
-                "requires": {"카드키": "카드키가 필요하다."}
-            },
-            "ward": {
-                "name": "병동",
-                "description": "병동 병실. 커튼이 바람도 없는데 가볍게 흔들린다. 금고가 있는 서랍이 있다.",
-                "items": ["의료기록"],
-                "interactions": ["커튼 확인", "병상 확인", "서랍 열기"],
-                "exits": ["corridor"]
-            },
-            "operating": {
-                "name": "수술실",
-                "description": "수술실. 작업등 몇 개가 아직 살아 있다. 바닥에는 오래된 얼룩이 남아 있다.",
-                "items": ["전지"],
-                "interactions": ["수술대 확인", "도구함 열기"],
-                "exits": ["corridor"]
-            },
-            "stairs": {
-                "name": "계단",
-                "description": "계단실. 아래로 내려갈수록 공기가 차갑고 무거워진다.",
-                "items": ["손전등"],
-                "interactions": ["지하 내려가기"],
-                "exits": ["corridor", "morgue"]
-            },
-            "morgue": {
-                "name": "시체안치실",
-                "description": "시체안치실. 서랍 몇 개가 반쯤 열려 있다. 이름표가 떨리는 듯 흔들린다. 벽에 비상 탈출구가 있다.",
-                "items": ["카드키", "비상등"],
-                "interactions": ["서랍 확인", "비상 탈출구 열기", "비상등 설치", "열쇠 사용"],
-                "exits": ["stairs"],
-                "requires": {"손전등": "어둡다. 손전등이 필요하다."}
-            }
-        }
+    def _store_bg_image(self, key: str, image: Optional[pygame.Surface]):
+        self.bg_images.put(key, image)
+        if image is not None:
+            print(f"✓ {key} 배경 준비 완료")
+        else:
+            print(f"⚠ {key}.jpg 없음 - 색상 배경 사용")
+        if key == self.current_room:
+            # 배경이 늦게 도착했으면 합성 배경을 다시 만들고 화면 전체를 다시 그림
+            self._backdrop_key = None
+            self._screen_key = None
+    
+    def background_image(self, key: str) -> Optional[pygame.Surface]:
+        """방 배경 Surface (캐시에서 빠졌으면 다시 읽고, 미리 읽는 중이면 None)"""
+        image = self.bg_images.get(key)
+        if image is not None or key in self.bg_images or key in self._prefetching:
+            return image
+        image = self._try_load_bg_image(key)
+        self._store_bg_image(key, image)
+        return image
+    
+    def prefetch_backgrounds(self):
+        """현재 방 배경을 준비하고, 이동할 수 있는 방의 배경을 미리 읽기 시작
+
+        현재 방 배경이 아직 준비되지 않았으면 기다리지 않고 색상 배경을 쓴다.
+        """
+        room = self.current_room
+        wanted = [room] + self.rooms[room]["exits"]
+        # 방을 옮기거나 문이 열려 출구가 바뀌었을 때만 확인
+        if self._prefetched_for == wanted:
+            return
+        self._prefetched_for = wanted
         
-        # 퍼즐 상태
-        self.puzzles = {
-            "security_monitor": False,  # 보안실 모니터 켜짐
-            "tape_played": False,       # 테이프 재생됨
-            "password_revealed": False, # 비밀번호 발견됨
-            "drawer_opened": False,     # 서랍 열림
-            "exit_ready": False         # 탈출구 준비됨
-        }
+        for key in wanted:
+            if key in self.bg_images or key in self._prefetching:
+                continue
+            future = self._prefetch_pool.submit(self._decode_bg_image, key, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            future.add_done_callback(_post_background_ready)
+            self._prefetching[key] = future
+    
+    def collect_prefetched(self):
+        """작업 스레드가 읽어 둔 배경을 화면 형식으로 변환 (메인 스레드에서만 호출)"""
+        for key, future in list(self._prefetching.items()):
+            if not future.done():
+                continue
+            del self._prefetching[key]
+            try:
+                image = future.result()
+            except Exception:
+                image = None
+            self._store_bg_image(key, image.convert() if image is not None else None)
+    
+    def close(self):
+        """미리 읽기 작업 스레드 정리, 남은 자동 저장 마무리"""
+        self._prefetch_pool.shutdown(wait=True, cancel_futures=True)
+        self._prefetching.clear()
         
+        if self.autosaver:
+            if self._save_pending:
+                self.save_game()
+            self.autosaver.close()
+        
+        if self.profiler and self.profile_output:
+            self.profiler.export(self.profile_output)
+            print(f"프레임 기록 저장: {self.profile_output}")
+        
+        stats = self.bg_images.stats()
+        print(f"배경 캐시: {stats['entries']}개 {stats['bytes'] / 1024 / 1024:.1f}MB"
+              f" / {stats['max_bytes'] / 1024 / 1024:.0f}MB, 적중 {stats['hits']}, 실패 {stats['misses']},"
+              f" 내보냄 {stats['evictions']}")
+    
+    def _load_asset_variants(self) -> Dict[str, Dict[str, str]]:
+        """assets/pyramid.json에서 방별 해상도 → 파일 이름 목록 읽기"""
+        try:
+            with open(os.path.join(ASSETS_DIR, "pyramid.json"), "r", encoding="utf-8") as f:
+                return json.load(f).get("rooms", {})
+        except (OSError, ValueError):
+            return {}
+    
     def _try_load_bg_image(self, key: str) -> Optional[pygame.Surface]:
+        """배경을 바로 읽어 화면 형식으로 변환"""
+        image = self._decode_bg_image(key, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        return image.convert() if image is not None else None
+    
+    def _decode_bg_image(self, key: str, size: tuple) -> Optional[pygame.Surface]:
+        """배경을 디코딩하고 size로 맞춘 Surface (화면 형식 변환 전)
+
+        화면에 의존하지 않으므로 작업 스레드에서 호출해도 된다.
+        """
+        if self.procedural_backgrounds:
+            return self._generate_bg_image(key, size)
+        
+        # 현재 화면 크기와 같은 해상도의 에셋이 있으면 그대로 사용
+        size_key = f"{size[0]}x{size[1]}"
+        variant = self.asset_variants.get(key, {}).get(size_key)
+        candidates = [variant] if variant else []
+        if f"{key}.jpg" not in candidates:
+            candidates.append(f"{key}.jpg")
+        for name in candidates:
+            path = os.path.join(ASSETS_DIR, name)
+            # 디코딩이 필요 없는 원시 픽셀 컨테이너 우선
+            img = self._try_load_raw_image(path, size)
+            if img is not None:
+                return img
+            if name == variant and os.path.isfile(path):
+                try:
+                    img = pygame.image.load(path)
+                    if img.get_size() == size:
+                        return img
+                except Exception:
+                    pass
+        
         for ext in (".jpg", ".png", ".jpeg"):
             path = os.path.join(ASSETS_DIR, f"{key}{ext}")
             if os.path.isfile(path):
                 try:
-                    img = pygame.image.load(path).convert()
-                    return pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                    img = pygame.image.load(path)
+                    return pygame.transform.scale(img, size)
                 except Exception:
                     return None
-        return None
+        # 에셋이 없으면 메모리에서 직접 생성
+        return self._generate_bg_image(key, size)
     
-    def show_message(self, message: str, duration: int = 120):
-        self.message = message
-        self.message_timer = duration
-    
-    def can_enter_room(self, room_name: str) -> tuple[bool, str]:
-        room = self.rooms[room_name]
-        if "requires" in room:
-            for item, message in room["requires"].items():
-                if not self.inventory.has_item(item):
-                    return False, message
-        return True, ""
-    
-    def move_to_room(self, room_name: str):
-        can_enter, message = self.can_enter_room(room_name)
-        if can_enter:
-            self.current_room = room_name
-            self.show_message(f"{self.rooms[room_name]['name']}에 도착했다.")
-        else:
-            self.show_message(message)
+    def _try_load_raw_image(self, image_path: str, size: tuple) -> Optional[pygame.Surface]:
+        """이미지 옆의 .bgra 컨테이너를 메모리 매핑해서 픽셀을 Surface로 복사
+
+        컨테이너가 없거나, 원본 이미지보다 오래되었거나, size와 다르면 None.
+        """
+        raw_path = rawimage.raw_path_for(image_path)
+        try:
+            if os.path.getmtime(raw_path) < os.path.getmtime(image_path):
+                return None
+        except OSError:
+            if not os.path.isfile(raw_path):
+                return None
+        try:
+            with rawimage.RawImage(raw_path) as raw:
+                if raw.size != size:
+                    return None
+                wrapped = pygame.image.frombuffer(raw.pixels, raw.size, raw.pixel_format)
+                surface = wrapped.copy()
+                # 매핑을 닫기 전에 버퍼를 참조하는 Surface를 먼저 해제
+                del wrapped
+                return surface
+        except (OSError, ValueError, pygame.error):
+            return None
     
-    def collect_item(self, item_name: str):
-        if item_name in self.items and item_name in self.rooms[self.current_room]["items"]:
-            if self.inventory.add_item(self.items[item_name]):
-                self.rooms[self.current_room]["items"].remove(item_name)
-                self.show_message(f"{item_name}을(를) 획득했다!")
-            else:
-                self.show_message("인벤토리가 가득 찼다.")
-        else:
-            self.show_message("그런 아이템은 없다.")
+    def _generate_bg_image(self, key: str, size: tuple) -> Optional[pygame.Surface]:
+        """배경 생성기로 메모리에서 바로 Surface 생성 (JPEG 인코딩/디코딩 없음)"""
+        try:
+            import create_high_quality_backgrounds as generator
+        except ImportError:
+            # Pillow가 없는 환경에서는 색상 배경 사용
+            return None
+        if key not in generator.ROOM_BUILDERS:
+            return None
+        img = generator.generate_room(key, self.background_seed)
+        if img.size != size:
+            img = img.resize(size)
+        return pygame.image.frombuffer(img.tobytes(), img.size, "RGB").copy()
     
-    def use_item(self, item_name: str):
-        if not self.inventory.has_item(item_name):
-            self.show_message("그런 아이템은 없다.")
-            return
-        
-        # 특정 아이템 사용 로직
-        if item_name == "열쇠" and self.current_room == "exterior":
-            self.move_to_room("lobby")
-            self.inventory.remove_item("열쇠")
-        elif item_name == "전지" and self.current_room == "security":
-            if not self.puzzles["security_monitor"]:
-                self.puzzles["security_monitor"] = True
-                self.show_message("모니터가 켜졌다!")
-                self.inventory.remove_item("전지")
-            else:
-                self.show_message("모니터가 이미 켜져 있다.")
-        elif item_name == "테이프" and self.current_room == "security":
-            if self.puzzles["security_monitor"]:
-                if not self.puzzles["tape_played"]:
-                    self.puzzles["tape_played"] = True
-                    self.show_message("테이프에서 중요한 정보를 발견했다!")
-                    self.inventory.remove_item("테이프")
-                else:
-                    self.show_message("테이프를 이미 재생했다.")
-            else:
-                self.show_message("먼저 모니터를 켜야 한다.")
-        elif item_name == "손전등":
-            self.show_message("손전등은 시체안치실에 들어가기 위해 필요하다.")
-        elif item_name == "비상등" and self.current_room == "morgue":
-            self.show_message("비상등을 설치하려면 '비상등 설치' 버튼을 클릭하세요.")
-        elif item_name == "탈출열쇠" and self.current_room == "morgue":
-            self.show_message("탈출열쇠를 사용하려면 '열쇠 사용' 버튼을 클릭하세요.")
-        elif item_name == "카드키":
-            if self.current_room == "lobby":
-                self.show_message("카드키로 보안실 문을 열 수 있다.")
-            elif self.current_room == "security":
-                self.show_message("보안실에 이미 들어왔다.")
-            else:
-                self.show_message("카드키는 보안실에서 사용할 수 있다.")
-        elif item_name == "지도":
-            self.show_message("병원 지도: 외부 → 로비 → 복도 → 보안실/병동/수술실/계단 → 시체안치실")
-        elif item_name == "의료기록":
-            self.show_message("의료기록에는 '환자 관찰 중'이라는 기록이 있다.")
-        else:
-            self.show_message(f"{item_name}을(를) 여기서 사용할 수 없다.")
+    @property
+    def current_room(self) -> str:
+        return self.engine.current_room
     
-    def interact(self, interaction: str):
-        room = self.rooms[self.current_room]
-        
-        if interaction == "정문 열기" and self.current_room == "exterior":
-            if self.inventory.has_item("열쇠"):
-                self.show_message("정문이 열렸다! 로비로 들어갈 수 있다.")
-                # 정문을 열면 로비로 이동할 수 있게 함
-                self.rooms["exterior"]["exits"] = ["lobby"]
-            else:
-                self.show_message("열쇠가 필요하다.")
-        elif interaction == "출구 찾기" and self.current_room == "lobby":
-            self.show_message("정문은 잠겨있다. 다른 출구를 찾아야 한다.")
-        elif interaction == "비상등 확인" and self.current_room == "lobby":
-            self.show_message("비상등이 깜빡인다. 무언가를 알려주는 것 같다.")
-        elif interaction == "휠체어 확인" and self.current_room == "corridor":
-            self.show_message("휠체어는 아직 따뜻하다. 누군가 최근에 사용한 것 같다.")
-        elif interaction == "모니터 켜기" and self.current_room == "security":
-            if self.puzzles["security_monitor"]:
-                self.show_message("모니터가 이미 켜져 있다.")
-            elif self.inventory.has_item("전지"):
-                self.puzzles["security_monitor"] = True
-                self.show_message("모니터가 켜졌다!")
-                self.inventory.remove_item("전지")
-            else:
-                self.show_message("전지가 필요하다.")
-        elif interaction == "테이프 재생" and self.current_room == "security":
-            if self.puzzles["tape_played"]:
-                self.show_message("테이프를 이미 재생했다.")
-            elif self.puzzles["security_monitor"] and self.inventory.has_item("테이프"):
-                self.puzzles["tape_played"] = True
-                self.puzzles["password_revealed"] = True
-                self.show_message("테이프에서 비밀번호를 발견했다: 1-9-7-3")
-                self.inventory.remove_item("테이프")
-            elif not self.puzzles["security_monitor"]:
-                self.show_message("먼저 모니터를 켜야 한다.")
-            else:
-                self.show_message("테이프가 필요하다.")
-        elif interaction == "커튼 확인" and self.current_room == "ward":
-            self.show_message("커튼 뒤에는 아무것도 없다.")
-        elif interaction == "병상 확인" and self.current_room == "ward":
-            self.show_message("병상에는 오래된 시트만 깔려있다.")
-        elif interaction == "서랍 열기" and self.current_room == "ward":
-            if self.puzzles["password_revealed"]:
-                if not self.puzzles["drawer_opened"]:
-                    self.puzzles["drawer_opened"] = True
-                    self.show_message("서랍이 열렸다! 탈출열쇠를 발견했다!")
-                    # 탈출열쇠를 바로 인벤토리에 추가
-                    if self.inventory.add_item(self.items["탈출열쇠"]):
-                        self.show_message("탈출열쇠를 획득했다!")
-                    else:
-                        self.show_message("인벤토리가 가득 찼다.")
-                else:
-                    self.show_message("서랍은 이미 열려있다.")
-            else:
-                self.show_message("잠겨있다.")
-        elif interaction == "수술대 확인" and self.current_room == "operating":
-            self.show_message("수술대에는 오래된 얼룩이 남아있다.")
-        elif interaction == "도구함 열기" and self.current_room == "operating":
-            self.show_message("도구함은 비어있다.")
-        elif interaction == "지하 내려가기" and self.current_room == "stairs":
-            self.move_to_room("morgue")
-        elif interaction == "서랍 확인" and self.current_room == "morgue":
-            if "카드키" in room["items"]:
-                self.show_message("서랍에서 카드키를 발견했다!")
-                if self.inventory.add_item(self.items["카드키"]):
-                    self.rooms[self.current_room]["items"].remove("카드키")
-                    self.show_message("카드키를 획득했다!")
-                else:
-                    self.show_message("인벤토리가 가득 찼다.")
-            else:
-                self.show_message("서랍은 이미 비어있다.")
-        elif interaction == "비상등 설치" and self.current_room == "morgue":
-            if self.inventory.has_item("비상등"):
-                self.puzzles["exit_ready"] = True
-                self.show_message("비상등을 설치했다. 탈출구가 밝혀졌다!")
-                self.inventory.remove_item("비상등")
-            else:
-                self.show_message("비상등이 필요하다.")
-        elif interaction == "열쇠 사용" and self.current_room == "morgue":
-            if self.inventory.has_item("탈출열쇠"):
-                if self.puzzles["exit_ready"]:
-                    self.show_message("탈출열쇠를 비상 탈출구에 끼웠다!")
-                    self.inventory.remove_item("탈출열쇠")
-                else:
-                    self.show_message("먼저 비상등을 설치해야 한다.")
-            else:
-                self.show_message("탈출열쇠가 필요하다.")
-        elif interaction == "비상 탈출구 열기" and self.current_room == "morgue":
-            if self.puzzles["exit_ready"]:
-                self.game_state = "escaped"
-                self.show_message("비상 탈출구를 열고 탈출에 성공했다!", 300)
-            else:
-                self.show_message("비상등과 탈출열쇠가 필요하다.")
-        else:
-            self.show_message("그런 상호작용은 없다.")
+    @property
+    def rooms(self) -> Dict[str, dict]:
+        return self.engine.rooms
+    
+    @property
+    def inventory(self):
+        return self.engine.inventory
+    
+    @property
+    def game_state(self) -> str:
+        return self.engine.game_state
+    
+    def show_message(self, message: str, duration: float = 2.0):
+        """메시지를 duration초 동안 표시"""
+        self.message = message
+        self.message_visible = True
+        self.message_expires = time.monotonic() + duration
     
     def draw_room_info(self):
         room = self.rooms[self.current_room]
         
         # 방 이름
-        room_name = font_large.render(room["name"], True, WHITE)
+        room_name = text_cache.render(font_large, room["name"], True, WHITE)
         screen.blit(room_name, (50, 50))
         
         # 방 설명
         desc_lines = self.wrap_text(room["description"], font_medium, SCREEN_WIDTH - 100)
         for i, line in enumerate(desc_lines):
-            desc_text = font_medium.render(line, True, WHITE)
+            desc_text = text_cache.render(font_medium, line, True, WHITE)
             screen.blit(desc_text, (50, 120 + i * 35))
     
     def draw_inventory(self):
@@ -456,92 +578,149 @@ class EscapeRoom:
         pygame.draw.rect(screen, WHITE, inv_rect, 2)
         
         # 인벤토리 제목
-        inv_title = font_medium.render("인벤토리", True, WHITE)
+        inv_title = text_cache.render(font_medium, "인벤토리", True, WHITE)
         screen.blit(inv_title, (SCREEN_WIDTH - 290, 60))
         
         # 아이템 목록
         for i, item in enumerate(self.inventory.items):
-            item_text = font_small.render(f"• {item.name}", True, WHITE)
+            item_text = text_cache.render(font_small, f"• {item.name}", True, WHITE)
             screen.blit(item_text, (SCREEN_WIDTH - 280, 100 + i * 25))
     
+    def layout(self) -> WidgetLayer:
+        """현재 방의 버튼 레이아웃 (방이나 화면 크기가 바뀌거나 클릭 후에만 다시 계산)"""
+        key = (self.current_room, screen.get_size())
+        if self._layout_key != key:
+            self.widgets.set_widgets(self._build_widgets())
+            self._layout_key = key
+        return self.widgets
+    
+    def invalidate_layout(self):
+        self._layout_key = None
+    
+    def _build_widgets(self) -> List[Widget]:
+        room = self.rooms[self.current_room]
+        widgets = []
+        
+        # 겹치는 버튼은 먼저 넣은 것이 클릭을 받음
+        def button(rect, action, group, label):
+            rect = pygame.Rect(rect)
+            text_rect = pygame.Rect((0, 0), font_small.size(label))
+            text_rect.center = rect.center
+            widgets.append(Widget(rect, action, group, label, text_rect))
+        
+        for i, interaction in enumerate(room["interactions"]):
+            button((50, SCREEN_HEIGHT - 200 + i * 40, 200, 35), ("interact", interaction), "interactions", interaction)
+        for i, item_name in enumerate(room["items"]):
+            button((50, SCREEN_HEIGHT - 320 + i * 40, 200, 35), ("collect", item_name), "items", item_name)
+        for i, exit_room in enumerate(room["exits"]):
+            button((300, SCREEN_HEIGHT - 170 + i * 40, 200, 35), ("move", exit_room), "exits",
+                   self.rooms[exit_room]["name"])
+        
+        # 인벤토리 아이템 줄 (클릭하면 사용)
+        for i, item in enumerate(self.inventory.items):
+            widgets.append(Widget((SCREEN_WIDTH - 300, 100 + i * 25, 250, 25), ("use", item.name), "inventory"))
+        return widgets
+    
     def draw_interactions(self):
         room = self.rooms[self.current_room]
+        layer = self.layout()
         
         # 상호작용 버튼들
-        button_y = SCREEN_HEIGHT - 200
-        for i, interaction in enumerate(room["interactions"]):
-            button_rect = pygame.Rect(50, button_y + i * 40, 200, 35)
-            
-            mouse_pos = pygame.mouse.get_pos()
-            if button_rect.collidepoint(mouse_pos):
-                pygame.draw.rect(screen, DARK_RED, button_rect)
-                pygame.draw.rect(screen, RED, button_rect, 2)
+        for widget in layer.group("interactions"):
+            if widget is layer.hovered:
+                pygame.draw.rect(screen, DARK_RED, widget.rect)
+                pygame.draw.rect(screen, RED, widget.rect, 2)
             else:
-                pygame.draw.rect(screen, GRAY, button_rect)
-                pygame.draw.rect(screen, WHITE, button_rect, 2)
+                pygame.draw.rect(screen, GRAY, widget.rect)
+                pygame.draw.rect(screen, WHITE, widget.rect, 2)
             
-            button_text = font_small.render(interaction, True, WHITE)
-            text_rect = button_text.get_rect(center=button_rect.center)
-            screen.blit(button_text, text_rect)
+            button_text = text_cache.render(font_small, widget.label, True, WHITE)
+            screen.blit(button_text, widget.text_rect)
         
         # 디버깅: 상호작용 버튼 개수 표시
-        debug_text = font_tiny.render(f"상호작용 버튼: {len(room['interactions'])}개", True, YELLOW)
+        debug_text = text_cache.render(font_tiny, f"상호작용 버튼: {len(room['interactions'])}개", True, YELLOW)
         screen.blit(debug_text, (50, SCREEN_HEIGHT - 250))
     
     def draw_items(self):
         room = self.rooms[self.current_room]
         
         if room["items"]:
-            items_text = font_medium.render("획득 가능한 아이템:", True, YELLOW)
+            items_text = text_cache.render(font_medium, "획득 가능한 아이템:", True, YELLOW)
             screen.blit(items_text, (50, SCREEN_HEIGHT - 350))
             
-            for i, item_name in enumerate(room["items"]):
-                item_rect = pygame.Rect(50, SCREEN_HEIGHT - 320 + i * 40, 200, 35)
-                
-                mouse_pos = pygame.mouse.get_pos()
-                if item_rect.collidepoint(mouse_pos):
-                    pygame.draw.rect(screen, GREEN, item_rect)
-                    pygame.draw.rect(screen, WHITE, item_rect, 2)
+            layer = self.layout()
+            for widget in layer.group("items"):
+                if widget is layer.hovered:
+                    pygame.draw.rect(screen, GREEN, widget.rect)
+                    pygame.draw.rect(screen, WHITE, widget.rect, 2)
                 else:
-                    pygame.draw.rect(screen, DARK_GRAY, item_rect)
-                    pygame.draw.rect(screen, WHITE, item_rect, 2)
+                    pygame.draw.rect(screen, DARK_GRAY, widget.rect)
+                    pygame.draw.rect(screen, WHITE, widget.rect, 2)
                 
-                item_text = font_small.render(item_name, True, WHITE)
-                text_rect = item_text.get_rect(center=item_rect.center)
-                screen.blit(item_text, text_rect)
+                item_text = text_cache.render(font_small, widget.label, True, WHITE)
+                screen.blit(item_text, widget.text_rect)
     
     def draw_exits(self):
-        room = self.rooms[self.current_room]
-        
-        exits_text = font_medium.render("이동 가능한 곳:", True, GREEN)
+        exits_text = text_cache.render(font_medium, "이동 가능한 곳:", True, GREEN)
         screen.blit(exits_text, (300, SCREEN_HEIGHT - 200))
         
-        for i, exit_room in enumerate(room["exits"]):
-            exit_rect = pygame.Rect(300, SCREEN_HEIGHT - 170 + i * 40, 200, 35)
-            
-            mouse_pos = pygame.mouse.get_pos()
-            if exit_rect.collidepoint(mouse_pos):
-                pygame.draw.rect(screen, GREEN, exit_rect)
-                pygame.draw.rect(screen, WHITE, exit_rect, 2)
+        layer = self.layout()
+        for widget in layer.group("exits"):
+            if widget is layer.hovered:
+                pygame.draw.rect(screen, GREEN, widget.rect)
+                pygame.draw.rect(screen, WHITE, widget.rect, 2)
             else:
-                pygame.draw.rect(screen, DARK_GRAY, exit_rect)
-                pygame.draw.rect(screen, WHITE, exit_rect, 2)
+                pygame.draw.rect(screen, DARK_GRAY, widget.rect)
+                pygame.draw.rect(screen, WHITE, widget.rect, 2)
             
-            exit_text = font_small.render(self.rooms[exit_room]["name"], True, WHITE)
-            text_rect = exit_text.get_rect(center=exit_rect.center)
-            screen.blit(exit_text, text_rect)
+            exit_text = text_cache.render(font_small, widget.label, True, WHITE)
+            screen.blit(exit_text, widget.text_rect)
     
     def draw_message(self):
-        if self.message_timer > 0:
+        if self.message_visible:
             message_bg = pygame.Rect(50, SCREEN_HEIGHT - 100, SCREEN_WIDTH - 100, 40)
             pygame.draw.rect(screen, BLACK, message_bg)
             pygame.draw.rect(screen, WHITE, message_bg, 2)
             
-            message_text = font_small.render(self.message, True, WHITE)
+            message_text = text_cache.render(font_small, self.message, True, WHITE)
             text_rect = message_text.get_rect(center=message_bg.center)
             screen.blit(message_text, text_rect)
-            
-            self.message_timer -= 1
+    
+    def update(self, now: Optional[float] = None):
+        """프레임마다 한 번 호출되는 상태 갱신 (시간은 time.monotonic() 기준)"""
+        now = time.monotonic() if now is None else now
+        if self.message_visible and now >= self.message_expires:
+            self.message_visible = False
+        
+        # 방을 옮겼으면 새 이웃 방 배경을 미리 읽고, 도착한 배경을 받아 옴
+        self.prefetch_backgrounds()
+        self.collect_prefetched()
+        
+        if self._save_pending and now >= self._autosave_at:
+            self.save_game()
+    
+    def time_until_update(self, now: Optional[float] = None) -> Optional[float]:
+        """다음에 화면이 저절로 바뀌거나 자동 저장할 때까지 남은 시간 (초, 할 일이 없으면 None)"""
+        now = time.monotonic() if now is None else now
+        deadlines = []
+        if self.message_visible:
+            deadlines.append(self.message_expires)
+        if self._save_pending:
+            deadlines.append(self._autosave_at)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+    
+    def save_game(self):
+        """지금 상태를 저장 (직렬화만 여기서 하고 파일 쓰기는 작업 스레드가 함)"""
+        self._save_pending = False
+        if self.autosaver is None:
+            return
+        if self.game_state == "escaped":
+            # 끝난 게임은 이어할 수 없으므로 저장 파일을 지움
+            self.autosaver.clear()
+        else:
+            self.autosaver.save(self.engine)
     
     def draw_ending(self):
         if self.game_state == "escaped":
@@ -550,9 +729,9 @@ class EscapeRoom:
             overlay.fill(BLACK)
             screen.blit(overlay, (0, 0))
             
-            title = font_large.render("탈출 성공!", True, GREEN)
-            subtitle = font_medium.render("폐병원에서 무사히 탈출했다.", True, WHITE)
-            instruction = font_small.render("클릭하면 게임이 종료됩니다", True, GRAY)
+            title = text_cache.render(font_large, "탈출 성공!", True, GREEN)
+            subtitle = text_cache.render(font_medium, "폐병원에서 무사히 탈출했다.", True, WHITE)
+            instruction = text_cache.render(font_small, "클릭하면 게임이 종료됩니다", True, GRAY)
             
             title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
@@ -584,92 +763,287 @@ class EscapeRoom:
         if self.game_state == "escaped":
             return "exit"
         
-        # 상호작용 버튼 클릭
+        widget = self.layout().hit(pos)
+        if widget is None:
+            return None
+        
+        self.engine.perform(widget.action)
+        
+        # 클릭으로 상태가 바뀌었을 수 있으므로 레이아웃을 다시 계산하고 자동 저장 예약
+        self.invalidate_layout()
+        if self.autosaver and not self._save_pending:
+            self._save_pending = True
+            self._autosave_at = time.monotonic() + savegame.AUTOSAVE_INTERVAL
+        return None
+    
+    def backdrop(self) -> pygame.Surface:
+        """현재 방의 배경과 어둠 효과를 한 장으로 합쳐 둔 표면
+
+        방이나 화면 모드가 바뀔 때만 다시 만든다.
+        """
+        key = (self.current_room, screen.get_size())
+        if self._backdrop_key != key:
+            with self.timed("backdrop"):
+                self._backdrop = self._bake_backdrop()
+            self._backdrop_key = key
+        return self._backdrop
+    
+    def _bake_backdrop(self) -> pygame.Surface:
+        backdrop = pygame.Surface(screen.get_size()).convert()
+        image = self.background_image(self.current_room)
+        
+        if image is not None:
+            backdrop.blit(image, (0, 0))
+        else:
+            backdrop.fill(self.backgrounds[self.current_room])
+        
+        # 어둠 효과
+        if self.current_room in DARK_ROOMS:
+            dark_surface = pygame.Surface(backdrop.get_size())
+            dark_surface.set_alpha(100)
+            dark_surface.fill(BLACK)
+            backdrop.blit(dark_surface, (0, 0))
+        return backdrop
+    
+    def draw_background(self, area: Optional[pygame.Rect] = None):
+        """배경 그리기 (area를 주면 그 부분만 복원)"""
+        area = area or screen.get_rect()
+        backdrop = self.backdrop()
+        with self.timed("background"):
+            screen.blit(backdrop, area.topleft, area)
+    
+    def timed(self, stage: str):
+        """프로파일러가 켜져 있으면 with 블록 시간을 stage 단계로 기록"""
+        return self.profiler.stage(stage) if self.profiler else nullcontext()
+    
+    def region_state(self, name: str) -> object:
+        """영역의 그림을 결정하는 값 (이전 프레임과 같으면 다시 그릴 필요 없음)"""
+        room = self.rooms[self.current_room]
+        
+        if name == "room_info":
+            return (room["name"], room["description"])
+        if name == "inventory":
+            return tuple(item.name for item in self.inventory.items)
+        if name in ("interactions", "items", "exits"):
+            # 버튼 목록은 레이아웃을 다시 계산할 때만 바뀜
+            layer = self.layout()
+            return (layer.version, layer.hovered_index(name))
+        if name == "message":
+            return self.message if self.message_visible else None
+        if name == "profiler":
+            return self.profiler.frame_count // PROFILER_REFRESH_FRAMES
+        raise KeyError(name)
+    
+    def region_bounds(self, name: str) -> Optional[pygame.Rect]:
+        """영역이 그리는 모든 픽셀을 덮는 사각형 (그리는 것이 없으면 None)"""
         room = self.rooms[self.current_room]
-        button_y = SCREEN_HEIGHT - 200
-        for i, interaction in enumerate(room["interactions"]):
-            button_rect = pygame.Rect(50, button_y + i * 40, 200, 35)
-            if button_rect.collidepoint(pos):
-                self.interact(interaction)
-                return None
         
-        # 아이템 클릭
-        if room["items"]:
-            for i, item_name in enumerate(room["items"]):
-                item_rect = pygame.Rect(50, SCREEN_HEIGHT - 320 + i * 40, 200, 35)
-                if item_rect.collidepoint(pos):
-                    self.collect_item(item_name)
-                    return None
+        def text_rect(font, text, **position):
+            rect = pygame.Rect((0, 0), font.size(text))
+            for attr, value in position.items():
+                setattr(rect, attr, value)
+            return rect
         
-        # 출구 클릭
-        for i, exit_room in enumerate(room["exits"]):
-            exit_rect = pygame.Rect(300, SCREEN_HEIGHT - 170 + i * 40, 200, 35)
-            if exit_rect.collidepoint(pos):
-                self.move_to_room(exit_room)
-                return None
+        def button_rects(group):
+            return [widget.bounds for widget in self.layout().group(group)]
         
-        # 인벤토리 아이템 클릭 (사용)
-        inv_rect = pygame.Rect(SCREEN_WIDTH - 300, 50, 250, 400)
-        if inv_rect.collidepoint(pos):
-            # 클릭한 위치에서 아이템 인덱스 계산
-            item_y = pos[1] - 100
-            item_index = item_y // 25
-            if 0 <= item_index < len(self.inventory.items):
-                self.use_item(self.inventory.items[item_index].name)
+        rects = []
+        if name == "room_info":
+            rects.append(text_rect(font_large, room["name"], topleft=(50, 50)))
+            desc_lines = self.wrap_text(room["description"], font_medium, SCREEN_WIDTH - 100)
+            for i, line in enumerate(desc_lines):
+                rects.append(text_rect(font_medium, line, topleft=(50, 120 + i * 35)))
+        elif name == "inventory":
+            rects.append(pygame.Rect(SCREEN_WIDTH - 300, 50, 250, 400))
+            for i, item in enumerate(self.inventory.items):
+                rects.append(text_rect(font_small, f"• {item.name}", topleft=(SCREEN_WIDTH - 280, 100 + i * 25)))
+        elif name == "interactions":
+            rects += button_rects("interactions")
+            debug = f"상호작용 버튼: {len(room['interactions'])}개"
+            rects.append(text_rect(font_tiny, debug, topleft=(50, SCREEN_HEIGHT - 250)))
+        elif name == "items":
+            if room["items"]:
+                rects.append(text_rect(font_medium, "획득 가능한 아이템:", topleft=(50, SCREEN_HEIGHT - 350)))
+                rects += button_rects("items")
+        elif name == "exits":
+            rects.append(text_rect(font_medium, "이동 가능한 곳:", topleft=(300, SCREEN_HEIGHT - 200)))
+            rects += button_rects("exits")
+        elif name == "message":
+            if self.message_visible:
+                message_bg = pygame.Rect(50, SCREEN_HEIGHT - 100, SCREEN_WIDTH - 100, 40)
+                rects += [message_bg, text_rect(font_small, self.message, center=message_bg.center)]
+        elif name == "profiler":
+            rects.append(self._profiler_rect())
         
-        return None
+        if not rects:
+            return None
+        return rects[0].unionall(rects[1:])
+    
+    def _profiler_rect(self) -> pygame.Rect:
+        return pygame.Rect(SCREEN_WIDTH - 320, SCREEN_HEIGHT - 160, 300, 140)
+    
+    def draw_profiler(self):
+        self.profiler.draw(screen, font_tiny, self._profiler_rect())
+    
+    def draw_frame(self):
+        """화면 전체 그리기"""
+        self.draw_background()
+        
+        # UI 그리기
+        for name in self.regions:
+            with self.timed(f"draw_{name}"):
+                getattr(self, f"draw_{name}")()
+        
+        if self.game_state == "escaped":
+            with self.timed("draw_ending"):
+                self.draw_ending()
+    
+    def render(self):
+        """이번 프레임 그리기
+
+        dirty-rect 모드에서는 상태가 바뀐 영역만 다시 그려서 그 부분만 화면에 반영한다.
+        방, 게임 상태, 화면 크기가 바뀌면 전체를 다시 그린다.
+        """
+        if not self.dirty_rects:
+            self.draw_frame()
+            with self.timed("flip"):
+                pygame.display.flip()
+            return
+        
+        states = {name: self.region_state(name) for name in self.regions}
+        screen_key = (self.current_room, self.game_state, screen.get_size())
+        
+        # 엔딩 화면은 반투명 오버레이가 전체를 덮으므로 바뀐 것이 있으면 전체를 다시 그림
+        escaped_changed = self.game_state == "escaped" and states != self._region_states
+        if screen_key != self._screen_key or escaped_changed:
+            self.draw_frame()
+            with self.timed("flip"):
+                pygame.display.flip()
+            self._screen_key = screen_key
+            self._region_states = states
+            self._region_bounds = {name: self.region_bounds(name) for name in self.regions}
+            return
+        
+        changed = [name for name in self.regions if states[name] != self._region_states.get(name)]
+        if not changed or self.game_state == "escaped":
+            return
+        
+        bounds = {name: self.region_bounds(name) for name in self.regions}
+        
+        def covered(name):
+            return [rect for rect in (self._region_bounds.get(name), bounds[name]) if rect]
+        
+        # 바뀐 영역과 겹치는 영역도 함께 다시 그려야 전체 그리기와 같은 결과가 됨
+        redraw = set(changed)
+        dirty = [rect for name in changed for rect in covered(name)]
+        grew = True
+        while grew:
+            grew = False
+            for name in self.regions:
+                if name not in redraw and any(rect.collidelist(dirty) != -1 for rect in covered(name)):
+                    redraw.add(name)
+                    dirty += covered(name)
+                    grew = True
+        
+        for rect in dirty:
+            self.draw_background(rect)
+        for name in self.regions:
+            if name in redraw:
+                with self.timed(f"draw_{name}"):
+                    getattr(self, f"draw_{name}")()
+        
+        with self.timed("flip"):
+            pygame.display.update(dirty)
+        self._region_states = states
+        self._region_bounds = bounds
     
     def run(self):
         clock = pygame.time.Clock()
         running = True
         
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:
-                        result = self.handle_click(event.pos)
-                        if result == "exit":
-                            running = False
+            # 메시지가 사라질 때까지만 기다리고, 바뀔 것이 없으면 이벤트가 올 때까지 잠듦
+            events = wait_for_events(self.time_until_update())
+            if self.profiler:
+                self.profiler.begin_frame()
             
-            # 화면 그리기
-            screen.fill(BLACK)
+            with self.timed("events"):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        # 창이 다시 보이면 화면 전체를 다시 그림
+                        self._screen_key = None
+                    elif event.type == pygame.MOUSEMOTION:
+                        self.layout().hover(event.pos)
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        self.layout().hover(event.pos)
+                        if event.button == 1:
+                            result = self.handle_click(event.pos)
+                            if result == "exit":
+                                running = False
             
-            # 배경 그리기
-            bg_color = self.backgrounds[self.current_room]
-            image = self.bg_images.get(self.current_room)
-            
-            if image is not None:
-                screen.blit(image, (0, 0))
-            else:
-                screen.fill(bg_color)
-            
-            # 어둠 효과
-            if self.current_room in ["lobby", "operating", "morgue", "ward", "security", "corridor", "stairs"]:
-                dark_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                dark_surface.set_alpha(100)
-                dark_surface.fill(BLACK)
-                screen.blit(dark_surface, (0, 0))
-            
-            # UI 그리기
-            self.draw_room_info()
-            self.draw_inventory()
-            self.draw_interactions()
-            self.draw_items()
-            self.draw_exits()
-            self.draw_message()
-            
-            if self.game_state == "escaped":
-                self.draw_ending()
+            with self.timed("update"):
+                self.update()
+            self.render()
             
-            pygame.display.flip()
+            if self.profiler:
+                self.profiler.end_frame()
             clock.tick(60)
         
+        self.close()
         pygame.quit()
         sys.exit()
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="금지 구역 - 폐병원 방탈출")
+    parser.add_argument("--procedural-bg", action="store_true",
+                        help="assets 폴더 대신 배경을 메모리에서 직접 생성 (Pillow 필요)")
+    parser.add_argument("--bg-seed", type=int, default=BACKGROUND_SEED,
+                        help=f"절차적 배경 생성 시드 (기본: {BACKGROUND_SEED})")
+    parser.add_argument("--size", default=None,
+                        help=f"창 크기 (예: 1920x1080, 기본: {SCREEN_WIDTH}x{SCREEN_HEIGHT})")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="전체 화면으로 실행 (화면 해상도 사용)")
+    parser.add_argument("--bg-cache-mb", type=int, default=BACKGROUND_CACHE_BYTES // (1024 * 1024),
+                        help=f"배경 이미지 캐시 용량 (MB, 기본: {BACKGROUND_CACHE_BYTES // (1024 * 1024)})")
+    parser.add_argument("--profile", action="store_true",
+                        help="프레임 단계별 시간을 재고 화면에 그래프로 표시")
+    parser.add_argument("--profile-out", default=None,
+                        help="종료할 때 프레임 기록을 저장할 파일 (.csv 또는 .json, --profile 포함)")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="바뀐 영역만 그리지 않고 매 프레임 화면 전체를 다시 그림")
+    parser.add_argument("--no-autosave", action="store_true",
+                        help="진행 상황을 자동 저장하지 않음")
+    args = parser.parse_args(argv)
+    
+    if args.size:
+        try:
+            width, height = (int(v) for v in args.size.lower().split("x"))
+        except ValueError:
+            parser.error(f"잘못된 창 크기: {args.size} (예: 1920x1080)")
+        args.size = (width, height)
+    return args
+
+def init_pygame(size: Optional[tuple] = None, fullscreen: bool = False):
+    """쓰는 서브시스템(화면, 글꼴)만 초기화하고 창을 엶"""
+    pygame.display.init()
+    pygame.font.init()
+    set_display_mode(size, fullscreen)
+    pygame.display.set_caption("금지 구역 - 폐병원 방탈출")
+
+def set_display_mode(size: Optional[tuple] = None, fullscreen: bool = False):
+    """화면 모드를 바꾸고 화면 크기 전역값을 실제 크기로 갱신"""
+    global screen, SCREEN_WIDTH, SCREEN_HEIGHT
+    if fullscreen:
+        screen = pygame.display.set_mode(size or (0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(size or (SCREEN_WIDTH, SCREEN_HEIGHT))
+    SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
+
+def main(argv=None):
+    args = parse_args(argv)
+    init_pygame(args.size, args.fullscreen)
     print("금지 구역 - 공포 방탈출 게임을 시작합니다...")
     print("게임을 종료하려면 창을 닫으세요.")
     
@@ -678,23 +1052,30 @@ def main():
     running = True
     
     while running:
-        for event in pygame.event.get():
+        menu.draw()
+        pygame.display.flip()
+        clock.tick(60)
+        
+        # 메뉴에는 움직이는 것이 없으므로 입력이 있을 때만 다시 그림
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 running = False
                 break
             
             result = menu.handle_input(event)
-            if result == "게임 시작":
-                game = EscapeRoom()
+            if result in ("게임 시작", "이어하기"):
+                game = EscapeRoom(procedural_backgrounds=args.procedural_bg, background_seed=args.bg_seed,
+                                  dirty_rects=not args.full_redraw,
+                                  bg_cache_bytes=args.bg_cache_mb * 1024 * 1024,
+                                  profiler=FrameProfiler() if args.profile or args.profile_out else None,
+                                  profile_output=args.profile_out,
+                                  autosave=not args.no_autosave,
+                                  resume=result == "이어하기")
                 game.run()
                 menu = MainMenu()
             elif result == "게임 종료":
                 running = False
                 break
-        
-        menu.draw()
-        pygame.display.flip()
-        clock.tick(60)
     
     pygame.quit()
     sys.exit()
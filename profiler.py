@@ -0,0 +1,118 @@
+import csv
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+# 프레임 프로파일러
+# 프레임마다 단계별(이벤트 처리, 배경, 각 draw_*, flip 등) 소요 시간을 고정 크기
+# 링 버퍼에 모으고, 화면 오버레이(프레임 시간 그래프, p50/p95/p99)로 보여 주며
+# 종료할 때 CSV나 JSON으로 내보낸다. 대기(event.wait)와 clock.tick 시간은 포함하지 않는다.
+
+DEFAULT_CAPACITY = 600
+PERCENTILES = (50, 95, 99)
+
+# 60fps 한 프레임 (그래프 기준선)
+FRAME_BUDGET = 1 / 60
+
+def percentile(values, p):
+    """정렬된 값 목록의 p번째 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+class FrameProfiler:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.frames = deque(maxlen=capacity)  # (프레임 시간, {단계: 시간}) 링 버퍼
+        self.stages = []  # 처음 나온 순서대로의 단계 이름
+        self.frame_count = 0
+        self._current = None
+        self._frame_start = 0.0
+
+    def begin_frame(self):
+        self._current = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self._current is None:
+            return
+        self.frames.append((time.perf_counter() - self._frame_start, self._current))
+        self.frame_count += 1
+        self._current = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록의 소요 시간을 현재 프레임의 name 단계에 더함"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                if name not in self.stages:
+                    self.stages.append(name)
+                self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+
+    def summary(self):
+        """프레임 전체와 단계별 평균, 백분위수 (초)"""
+        columns = {"frame": [total for total, _ in self.frames]}
+        for name in self.stages:
+            columns[name] = [stages.get(name, 0.0) for _, stages in self.frames]
+
+        result = {}
+        for name, values in columns.items():
+            ordered = sorted(values)
+            entry = {"mean": sum(ordered) / len(ordered) if ordered else 0.0}
+            for p in PERCENTILES:
+                entry[f"p{p}"] = percentile(ordered, p)
+            result[name] = entry
+        return result
+
+    def export(self, path: str):
+        """링 버퍼 내용을 내보냄 (.csv면 프레임별 행, 그 외에는 요약을 포함한 JSON, 단위 ms)"""
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in self.stages])
+                first = self.frame_count - len(self.frames)
+                for i, (total, stages) in enumerate(self.frames):
+                    writer.writerow([first + i, f"{total * 1000:.3f}"] +
+                                    [f"{stages.get(name, 0.0) * 1000:.3f}" for name in self.stages])
+            return
+
+        report = {
+            "frames": self.frame_count,
+            "recorded": len(self.frames),
+            "stages": self.stages,
+            "summary_ms": {name: {k: v * 1000 for k, v in entry.items()}
+                           for name, entry in self.summary().items()},
+            "frame_ms": [round(total * 1000, 3) for total, _ in self.frames],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def draw(self, surface: pygame.Surface, font: pygame.font.Font, rect: pygame.Rect):
+        """rect 안에 최근 프레임 시간 그래프와 백분위수 표시"""
+        panel = pygame.Surface(rect.size)
+        panel.set_alpha(200)
+        panel.fill((0, 0, 0))
+        surface.blit(panel, rect.topleft)
+        pygame.draw.rect(surface, (255, 255, 255), rect, 1)
+
+        graph = pygame.Rect(rect.x + 5, rect.y + 25, rect.width - 10, rect.height - 30)
+        totals = [total for total, _ in self.frames][-graph.width:]
+        scale = graph.height / (FRAME_BUDGET * 2)
+        for i, total in enumerate(totals):
+            height = min(graph.height, max(1, int(total * scale)))
+            color = (0, 255, 0) if total <= FRAME_BUDGET else (255, 0, 0)
+            x = graph.right - len(totals) + i
+            pygame.draw.line(surface, color, (x, graph.bottom - 1), (x, graph.bottom - height))
+        budget_y = graph.bottom - int(FRAME_BUDGET * scale)
+        pygame.draw.line(surface, (255, 255, 0), (graph.left, budget_y), (graph.right, budget_y))
+
+        frame = self.summary()["frame"]
+        label = "  ".join(f"p{p} {frame[f'p{p}'] * 1000:.2f}ms" for p in PERCENTILES)
+        surface.blit(font.render(label, True, (255, 255, 255)), (rect.x + 5, rect.y + 4))
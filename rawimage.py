@@ -0,0 +1,84 @@
+import mmap
+import os
+import struct
+
+# 디코딩 없이 바로 화면에 쓸 수 있는 원시 픽셀 컨테이너 (.bgra)
+#
+# 32바이트 헤더 뒤에 행들이 빈틈없이 이어진다 (리틀 엔디언).
+#   magic(4) "ESCR" | version(u16) | header_size(u16) | width(u32) | height(u32)
+#   | pitch(u32, 한 행의 바이트 수) | pixel_format(4, 예: "BGRA") | 예약(8)
+# BGRA는 32비트 디스플레이 표면의 메모리 배치와 같아서 pygame.image.frombuffer로
+# 그대로 감쌀 수 있다.
+
+MAGIC = b"ESCR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII4s8x")
+HEADER_SIZE = HEADER.size
+
+PIXEL_FORMAT = "BGRA"
+BYTES_PER_PIXEL = {"BGRA": 4, "RGBA": 4, "RGBX": 4, "RGB": 3, "BGR": 3}
+
+RAW_EXTENSION = ".bgra"
+
+def raw_path_for(image_path):
+    """lobby@1920x1080.jpg → lobby@1920x1080.bgra"""
+    return os.path.splitext(image_path)[0] + RAW_EXTENSION
+
+def write_raw_image(path, width, height, data, pixel_format=PIXEL_FORMAT):
+    """픽셀 데이터를 컨테이너 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    if pixel_format not in BYTES_PER_PIXEL:
+        raise ValueError(f"지원하지 않는 픽셀 형식: {pixel_format}")
+    pitch = width * BYTES_PER_PIXEL[pixel_format]
+    if len(data) != pitch * height:
+        raise ValueError(f"픽셀 데이터 크기가 맞지 않습니다: {len(data)} != {pitch * height}")
+
+    header = HEADER.pack(MAGIC, VERSION, HEADER_SIZE, width, height, pitch, pixel_format.encode("ascii"))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def read_raw_header(buffer):
+    """헤더를 읽어 (width, height, pitch, pixel_format, data_offset) 반환
+
+    형식이 맞지 않으면 ValueError를 낸다.
+    """
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError("헤더가 잘렸습니다")
+    magic, version, header_size, width, height, pitch, pixel_format = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("컨테이너 파일이 아닙니다")
+    if version != VERSION:
+        raise ValueError(f"지원하지 않는 버전: {version}")
+    pixel_format = pixel_format.decode("ascii").rstrip("\0")
+    if pixel_format not in BYTES_PER_PIXEL or pitch < width * BYTES_PER_PIXEL[pixel_format]:
+        raise ValueError(f"잘못된 픽셀 형식: {pixel_format}")
+    if len(buffer) < header_size + pitch * height:
+        raise ValueError("픽셀 데이터가 잘렸습니다")
+    return width, height, pitch, pixel_format, header_size
+
+class RawImage:
+    """메모리 매핑된 컨테이너 파일 (pixels는 복사 없이 파일을 가리키는 memoryview)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.width, self.height, self.pitch, self.pixel_format, offset = read_raw_header(self._map)
+        except ValueError:
+            self._map.close()
+            raise
+        self.size = (self.width, self.height)
+        self.pixels = memoryview(self._map)[offset:offset + self.pitch * self.height]
+
+    def close(self):
+        self.pixels.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
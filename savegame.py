@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from escape_engine import EscapeEngine, SaveError
+
+# 저장과 불러오기
+# 엔진 스냅샷(EscapeEngine.snapshot)을 한 줄짜리 JSON으로 저장한다.
+# 자동 저장은 스냅샷을 만들고 직렬화하는 일만 메인 스레드에서 하고,
+# 파일 쓰기는 작업 스레드가 임시 파일에 쓴 뒤 os.replace로 바꿔치기해
+# 저장 중에 꺼져도 이전 저장 파일이 깨지지 않는다.
+
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "savegame.json")
+
+# 상태가 바뀐 뒤 자동 저장까지 기다리는 최대 시간 (초)
+AUTOSAVE_INTERVAL = 5.0
+
+def encode(snapshot: dict) -> bytes:
+    return json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_atomic(path: str, data: bytes):
+    """같은 폴더의 임시 파일에 쓴 뒤 한 번에 바꿔치기"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".save-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def has_save(path: str = SAVE_PATH) -> bool:
+    return os.path.isfile(path)
+
+def load_snapshot(path: str = SAVE_PATH) -> Optional[dict]:
+    """저장 파일의 스냅샷 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_into(engine: EscapeEngine, path: str = SAVE_PATH) -> bool:
+    """저장 파일을 엔진에 불러옴 (실패하면 엔진은 처음 상태로 남음)"""
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        return False
+    try:
+        engine.restore(snapshot)
+    except SaveError as e:
+        print(f"⚠ 저장 파일을 불러올 수 없습니다: {e}")
+        return False
+    return True
+
+class AutoSaver:
+    """엔진 상태를 작업 스레드에서 파일에 저장
+
+    save()는 스냅샷을 직렬화해 넘기기만 하고 바로 돌아온다.
+    쓰기는 한 스레드가 순서대로 하므로 마지막으로 넘긴 상태가 파일에 남는다.
+    """
+
+    def __init__(self, path: str = SAVE_PATH):
+        self.path = path
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._last_data: Optional[bytes] = None
+        self.saves = 0
+
+    def save(self, engine: EscapeEngine) -> bool:
+        """바뀐 것이 있으면 저장을 예약하고 True 반환"""
+        data = encode(engine.snapshot())
+        if data == self._last_data:
+            return False
+        self._last_data = data
+        self._pool.submit(self._write, data)
+        self.saves += 1
+        return True
+
+    def clear(self):
+        """저장 파일 삭제 (게임을 끝냈을 때)"""
+        self._last_data = None
+        self._pool.submit(self._remove)
+
+    def close(self):
+        """남은 쓰기를 마칠 때까지 기다림"""
+        self._pool.shutdown(wait=True)
+
+    def _write(self, data: bytes):
+        try:
+            write_atomic(self.path, data)
+        except OSError as e:
+            print(f"⚠ 자동 저장 실패: {e}")
+
+    def _remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠ 저장 파일 삭제 실패: {e}")
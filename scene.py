@@ -0,0 +1,239 @@
+from PIL import Image, ImageDraw, ImageEnhance
+import json
+import os
+import random
+
+from gradients import multi_stop_gradient
+from lighting import PointLight, composite_lights
+from textures import create_noise_texture
+
+# 선언적 장면 형식
+#
+# 장면 파일(JSON)은 배경색, 레이어 목록, 마지막 밝기 조정으로 이루어진다.
+#
+#   {
+#     "size": [1280, 720],
+#     "background": [8, 8, 8],
+#     "layers": [
+#       {"name": "벽", "blend": "normal", "primitives": [...]},
+#       {"name": "안개", "blend": "alpha", "primitives": [...]}
+#     ],
+#     "brightness": 0.5
+#   }
+#
+# blend가 "normal"인 레이어는 바탕 이미지에 바로 그리고, "alpha"인 레이어는
+# 한 장의 RGBA 오버레이에 모두 그린 뒤 한 번만 합성한다. 레이어 안의 광원은
+# 모아서 composite_lights로 한 번에 합성한다.
+#
+# 도형 종류:
+#   rect / ellipse  {"box": [x1, y1, x2, y2], "fill": 색, "outline": 색, "width": n}
+#   line            {"points": [[x, y], ...], "fill": 색, "width": n}
+#   text            {"xy": [x, y], "text": "환자 {n}", "fill": 색}  ({i}: 0부터, {n}: 1부터 반복 번호)
+#   tiles           {"area": [x1, y1, x2, y2], "size": n, "colors": [색, 색]}  체크무늬 바닥
+#   noise           {"at": [x, y], "size": [w, h], "base": 색, "scale": 흐림, "mix": 비율}
+#   gradient        {"at": [x, y], "size": [w, h], "stops": [[위치, 색], ...], "direction": "vertical"}
+#   fog             {"count": n, "area": [x1, y1, x2, y2], "size": [최소, 최대],
+#                    "alpha": [최소, 최대], "color": 색}  무작위 타원 안개
+#   fill            {"color": 색}  레이어 전체 채우기
+#   light           {"position": [x, y], "color": 색, "radius": r, "alpha": a, "rings": n, "falloff": f}
+#   repeat          {"count": n 또는 [nx, ny], "step": [dx, dy], "primitives": [...]}
+#                   {"at": [[dx, dy], ...], "primitives": [...]}
+
+SCENES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenes')
+
+BLEND_MODES = ('normal', 'alpha')
+
+# 반복 오프셋을 적용할 좌표 필드
+_BOX_FIELDS = ('box', 'area')
+_POINT_FIELDS = ('xy', 'at', 'position')
+
+class SceneError(ValueError):
+    """장면 파일 형식 오류"""
+
+def _color(value):
+    if value is None:
+        return None
+    return tuple(int(c) for c in value)
+
+def _offset_primitive(primitive, dx, dy, index):
+    """반복 오프셋과 번호를 적용한 도형 사본"""
+    moved = dict(primitive)
+    for field in _BOX_FIELDS:
+        if field in moved:
+            x1, y1, x2, y2 = moved[field]
+            moved[field] = [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+    for field in _POINT_FIELDS:
+        if field in moved:
+            x, y = moved[field]
+            moved[field] = [x + dx, y + dy]
+    if 'points' in moved:
+        moved['points'] = [[x + dx, y + dy] for x, y in moved['points']]
+    if 'text' in moved and index is not None:
+        moved['text'] = moved['text'].format(i=index, n=index + 1)
+    return moved
+
+def _repeat_offsets(primitive):
+    if 'at' in primitive:
+        return [tuple(offset) for offset in primitive['at']]
+    count = primitive.get('count', 1)
+    dx, dy = primitive.get('step', (0, 0))
+    if isinstance(count, (list, tuple)):
+        nx, ny = count
+        return [(i * dx, j * dy) for i in range(nx) for j in range(ny)]
+    return [(i * dx, i * dy) for i in range(count)]
+
+def _expand(primitives, dx=0, dy=0, index=None):
+    """repeat를 풀어 좌표가 확정된 도형 목록으로 펼침"""
+    for primitive in primitives:
+        kind = primitive.get('type')
+        if kind == 'repeat':
+            children = primitive.get('primitives', [])
+            for i, (ox, oy) in enumerate(_repeat_offsets(primitive)):
+                yield from _expand(children, dx + ox, dy + oy, i)
+        else:
+            yield _offset_primitive(primitive, dx, dy, index)
+
+class CompiledLayer:
+    """좌표가 확정된 그리기 명령과 광원을 담은 레이어"""
+
+    def __init__(self, name, blend, ops, lights):
+        self.name = name
+        self.blend = blend
+        self.ops = ops
+        self.lights = lights
+
+class CompiledScene:
+    """한 번 컴파일해 두고 난수 생성기만 바꿔 여러 번 렌더링할 수 있는 장면"""
+
+    def __init__(self, size, background, layers, brightness):
+        self.size = size
+        self.background = background
+        self.layers = layers
+        self.brightness = brightness
+
+    def render(self, rng=random):
+        img = Image.new('RGB', self.size, self.background)
+        for layer in self.layers:
+            if layer.ops:
+                if layer.blend == 'alpha':
+                    overlay = Image.new('RGBA', self.size, (0, 0, 0, 0))
+                    _run_ops(overlay, layer.ops, rng)
+                    img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+                else:
+                    _run_ops(img, layer.ops, rng)
+            if layer.lights:
+                img = composite_lights(img, layer.lights)
+
+        if self.brightness != 1.0:
+            img = ImageEnhance.Brightness(img).enhance(self.brightness)
+        return img
+
+def _compile_op(primitive):
+    kind = primitive.get('type')
+    fill = _color(primitive.get('fill'))
+    if kind in ('rect', 'ellipse'):
+        return (kind, [int(v) for v in primitive['box']], fill,
+                _color(primitive.get('outline')), int(primitive.get('width', 1)))
+    if kind == 'line':
+        return (kind, [tuple(point) for point in primitive['points']], fill, int(primitive.get('width', 1)))
+    if kind == 'text':
+        return (kind, tuple(primitive['xy']), primitive['text'], fill)
+    if kind == 'tiles':
+        return (kind, tuple(primitive['area']), int(primitive['size']),
+                [_color(c) for c in primitive['colors']])
+    if kind == 'noise':
+        return (kind, tuple(primitive['at']), tuple(primitive['size']), _color(primitive['base']),
+                primitive.get('scale', 1), primitive.get('mix', 0.1))
+    if kind == 'gradient':
+        stops = [(pos, _color(color)) for pos, color in primitive['stops']]
+        return (kind, tuple(primitive['at']), tuple(primitive['size']), stops,
+                primitive.get('direction', 'vertical'))
+    if kind == 'fog':
+        return (kind, int(primitive['count']), tuple(primitive['area']), tuple(primitive['size']),
+                tuple(primitive['alpha']), _color(primitive['color']))
+    if kind == 'fill':
+        return (kind, _color(primitive['color']))
+    raise SceneError(f"알 수 없는 도형 종류: {kind}")
+
+def _run_ops(target, ops, rng):
+    """그리기 명령을 순서대로 대상 이미지에 적용"""
+    draw = ImageDraw.Draw(target)
+    for op in ops:
+        kind = op[0]
+        if kind == 'rect':
+            _, box, fill, outline, width = op
+            draw.rectangle(box, fill=fill, outline=outline, width=width)
+        elif kind == 'ellipse':
+            _, box, fill, outline, width = op
+            draw.ellipse(box, fill=fill, outline=outline, width=width)
+        elif kind == 'line':
+            _, points, fill, width = op
+            draw.line(points, fill=fill, width=width)
+        elif kind == 'text':
+            _, xy, text, fill = op
+            draw.text(xy, text, fill=fill)
+        elif kind == 'tiles':
+            _, (x1, y1, x2, y2), size, colors = op
+            for x in range(x1, x2, size):
+                for y in range(y1, y2, size):
+                    color = colors[0] if (x + y) % (size * 2) == 0 else colors[1]
+                    draw.rectangle([x, y, x+size, y+size], fill=color)
+        elif kind == 'noise':
+            _, at, (width, height), base, scale, mix = op
+            noise = create_noise_texture(width, height, scale, rng=rng)
+            overlay = Image.blend(Image.new('RGB', (width, height), base), noise, mix)
+            target.paste(overlay, at)
+        elif kind == 'gradient':
+            _, at, (width, height), stops, direction = op
+            target.paste(multi_stop_gradient(width, height, stops, direction), at)
+        elif kind == 'fog':
+            _, count, (x1, y1, x2, y2), (min_size, max_size), (min_alpha, max_alpha), color = op
+            for _ in range(count):
+                x = rng.randint(x1, x2)
+                y = rng.randint(y1, y2)
+                size = rng.randint(min_size, max_size)
+                alpha = rng.randint(min_alpha, max_alpha)
+                draw.ellipse([x-size//2, y-size//4, x+size//2, y+size//4], fill=color + (alpha,))
+        elif kind == 'fill':
+            draw.rectangle([0, 0, target.width, target.height], fill=op[1])
+
+def compile_scene(data):
+    """장면 데이터(dict)를 레이어별 그리기 명령으로 컴파일"""
+    size = tuple(data.get('size', (1280, 720)))
+    background = _color(data.get('background', (0, 0, 0)))
+    layers = []
+    for index, layer in enumerate(data.get('layers', [])):
+        name = layer.get('name', f"layer{index}")
+        blend = layer.get('blend', 'normal')
+        if blend not in BLEND_MODES:
+            raise SceneError(f"레이어 '{name}'의 합성 방식이 잘못되었습니다: {blend}")
+
+        ops = []
+        lights = []
+        for primitive in _expand(layer.get('primitives', [])):
+            if primitive.get('type') == 'light':
+                lights.append(PointLight(primitive['position'], primitive['color'], primitive['radius'],
+                                         alpha=primitive.get('alpha', 50), rings=primitive.get('rings', 8),
+                                         falloff=primitive.get('falloff')))
+            else:
+                try:
+                    ops.append(_compile_op(primitive))
+                except KeyError as e:
+                    raise SceneError(f"레이어 '{name}'의 {primitive.get('type')} 도형에 {e} 항목이 없습니다")
+        layers.append(CompiledLayer(name, blend, ops, lights))
+
+    return CompiledScene(size, background, layers, float(data.get('brightness', 1.0)))
+
+def scene_path(name):
+    return os.path.join(SCENES_DIR, f"{name}.json")
+
+def available_scenes():
+    """scenes 폴더에 있는 장면 이름 목록"""
+    if not os.path.isdir(SCENES_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(SCENES_DIR) if f.endswith('.json'))
+
+def load_scene(name):
+    """scenes 폴더의 장면 파일을 읽어 컴파일"""
+    with open(scene_path(name), 'r', encoding='utf-8') as f:
+        return compile_scene(json.load(f))
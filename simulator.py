@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+from escape_engine import DEFAULT_CONTENT, EscapeEngine, load_content
+
+# 일괄 플레이 시뮬레이터
+# 화면 없이 엔진만으로 무작위(또는 스크립트를 따르는) 플레이를 여러 번 돌려
+# 탈출 성공률, 탈출까지 걸린 단계 수 분포, 나온 메시지별 횟수, 초당 실행 수를 집계한다.
+# 실행은 묶음으로 나눠 프로세스 풀에 보내고, 각 실행의 난수는 (시드, 실행 번호)로 정해지므로
+# 작업 프로세스 수와 관계없이 같은 결과가 나온다.
+#
+#   python simulator.py -n 20000
+#   python simulator.py --script solution.json --noise 0.2
+#   python simulator.py --content content/hospital.json --json sim.json
+
+DEFAULT_RUNS = 10000
+DEFAULT_MAX_STEPS = 500
+SIM_SEED = 1973
+
+# 한 작업 묶음의 최대 실행 수 (작을수록 고르게 나뉘고, 클수록 프로세스 간 전달이 줄어듦)
+MAX_BATCH = 1000
+
+# 보고서에 보여 줄 메시지 수
+MAX_MESSAGES = 20
+
+def parse_action(text: str) -> tuple:
+    """"종류:대상" 문자열을 행동 튜플로 (solver.py 출력 형식)"""
+    kind, sep, target = text.partition(":")
+    if not sep:
+        raise ValueError(f"잘못된 행동: {text} (예: move:lobby)")
+    return kind, target
+
+def load_script(path: str) -> List[tuple]:
+    """행동 목록 JSON (문자열 목록, 또는 solver.py --json 결과의 solution)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("solution") or []
+    return [parse_action(text) for text in data]
+
+def play(engine: EscapeEngine, rng: random.Random, max_steps: int, script: List[tuple], noise: float) -> int:
+    """한 판 진행 후 사용한 단계 수 반환
+
+    스크립트가 있으면 순서대로 따르되 noise 확률로 무작위 행동을 끼워 넣고,
+    스크립트가 끝났거나 다음 행동을 지금 할 수 없으면 무작위로 진행한다.
+    """
+    position = 0
+    for step in range(max_steps):
+        if engine.game_state == "escaped":
+            return step
+        actions = engine.actions()
+        if not actions:
+            return step
+        action = None
+        if position < len(script) and rng.random() >= noise:
+            if script[position] in actions:
+                action = script[position]
+                position += 1
+        if action is None:
+            action = rng.choice(actions)
+        engine.perform(action)
+    return max_steps
+
+def simulate_batch(content_path: str, first: int, count: int, seed: int, max_steps: int,
+                   script: List[tuple], noise: float) -> dict:
+    """실행 번호 first부터 count번 실행한 집계 (작업 프로세스에서 호출)"""
+    content = load_content(content_path)
+    messages = Counter()
+    escape_steps = []
+    total_steps = 0
+
+    def on_message(message, duration):
+        messages[message] += 1
+
+    for run in range(first, first + count):
+        engine = EscapeEngine(on_message=on_message, content=content)
+        steps = play(engine, random.Random(seed * 1_000_003 + run), max_steps, script, noise)
+        total_steps += steps
+        if engine.game_state == "escaped":
+            escape_steps.append(steps)
+
+    return {"runs": count, "escape_steps": escape_steps, "total_steps": total_steps, "messages": messages}
+
+def percentile(values, p):
+    """정렬된 값 목록의 p번째 백분위수 (nearest-rank)"""
+    if not values:
+        return 0
+    rank = max(1, -(-p * len(values) // 100))
+    return values[rank - 1]
+
+def histogram(values: List[int], max_steps: int, buckets: int = 10) -> List[dict]:
+    """단계 수를 같은 폭의 구간으로 나눈 개수 (마지막 구간은 max_steps까지 포함)"""
+    width = max(1, -(-max_steps // buckets))
+    buckets = min(buckets, max_steps // width + 1)
+    if buckets < 1:
+        return []
+    counts = Counter(min(value // width, buckets - 1) for value in values)
+    result = [{"from": i * width, "to": (i + 1) * width - 1, "count": counts[i]} for i in range(buckets)]
+    result[-1]["to"] = max(result[-1]["to"], max_steps)
+    return result
+
+def batches(runs: int, jobs: int):
+    """(첫 실행 번호, 실행 수) 목록 (프로세스마다 여러 묶음이 돌아가도록 나눔)"""
+    size = max(1, min(MAX_BATCH, runs // (jobs * 8) or 1))
+    return [(first, min(size, runs - first)) for first in range(0, runs, size)]
+
+def run_simulation(content_path: str, runs: int, jobs: int, seed: int, max_steps: int,
+                   script: Optional[List[tuple]] = None, noise: float = 0.0) -> dict:
+    script = script or []
+    messages = Counter()
+    escape_steps = []
+    total_steps = 0
+
+    def merge(result):
+        nonlocal total_steps
+        messages.update(result["messages"])
+        escape_steps.extend(result["escape_steps"])
+        total_steps += result["total_steps"]
+
+    start = time.perf_counter()
+    work = batches(runs, jobs)
+    if jobs <= 1:
+        for first, count in work:
+            merge(simulate_batch(content_path, first, count, seed, max_steps, script, noise))
+    else:
+        # 실행마다 독립적이므로 묶음 단위로 프로세스 풀에 나눠서 실행
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(simulate_batch, content_path, first, count, seed, max_steps, script, noise)
+                       for first, count in work]
+            for future in as_completed(futures):
+                merge(future.result())
+    elapsed = time.perf_counter() - start
+
+    escape_steps.sort()
+    escaped = len(escape_steps)
+    return {
+        "runs": runs,
+        "jobs": jobs,
+        "seed": seed,
+        "max_steps": max_steps,
+        "scripted": bool(script),
+        "noise": noise,
+        "escaped": escaped,
+        "completion_rate": escaped / runs if runs else 0.0,
+        "escape_steps": {
+            "min": escape_steps[0] if escape_steps else 0,
+            "mean": sum(escape_steps) / escaped if escaped else 0.0,
+            "p50": percentile(escape_steps, 50),
+            "p90": percentile(escape_steps, 90),
+            "p99": percentile(escape_steps, 99),
+            "max": escape_steps[-1] if escape_steps else 0,
+        },
+        "histogram": histogram(escape_steps, max_steps),
+        "total_steps": total_steps,
+        "seconds": elapsed,
+        "runs_per_second": runs / elapsed if elapsed else 0.0,
+        "steps_per_second": total_steps / elapsed if elapsed else 0.0,
+        "messages": dict(messages.most_common()),
+    }
+
+def print_report(report: dict):
+    mode = f"스크립트 (noise {report['noise']})" if report["scripted"] else "무작위"
+    print(f"{report['runs']}판 실행 ({mode}, 최대 {report['max_steps']}단계, 작업 {report['jobs']}개)")
+    print(f"  탈출 성공: {report['escaped']}판 ({report['completion_rate'] * 100:.1f}%)")
+
+    steps = report["escape_steps"]
+    if report["escaped"]:
+        print(f"  탈출까지 단계 수: 최소 {steps['min']}, 평균 {steps['mean']:.1f}, p50 {steps['p50']},"
+              f" p90 {steps['p90']}, p99 {steps['p99']}, 최대 {steps['max']}")
+        peak = max((bucket["count"] for bucket in report["histogram"]), default=0)
+        for bucket in report["histogram"]:
+            bar = "#" * round(bucket["count"] / peak * 40) if peak else ""
+            print(f"    {bucket['from']:5}-{bucket['to']:<5} {bucket['count']:7} {bar}")
+
+    print(f"\n메시지 {len(report['messages'])}종류:")
+    for message, count in list(report["messages"].items())[:MAX_MESSAGES]:
+        print(f"  {count:9}  {message}")
+    if len(report["messages"]) > MAX_MESSAGES:
+        print(f"  ... 외 {len(report['messages']) - MAX_MESSAGES}종류")
+
+    print(f"\n{report['seconds']:.2f}초, 초당 {report['runs_per_second']:.0f}판"
+          f" ({report['steps_per_second']:.0f}단계/초)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="화면 없이 엔진으로 여러 판을 플레이해 결과를 집계")
+    parser.add_argument("-n", "--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"실행할 판 수 (기본: {DEFAULT_RUNS})")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="작업 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS,
+                        help=f"한 판의 최대 단계 수 (기본: {DEFAULT_MAX_STEPS})")
+    parser.add_argument("--seed", type=int, default=SIM_SEED, help=f"난수 시드 (기본: {SIM_SEED})")
+    parser.add_argument("--script", default=None,
+                        help="따라 할 행동 목록 JSON (\"move:lobby\" 같은 문자열 목록 또는 solver.py --json 결과)")
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="스크립트를 따를 때 무작위 행동을 끼워 넣을 확률 (0~1)")
+    parser.add_argument("--content", default=DEFAULT_CONTENT, help="콘텐츠 파일 (기본: content/hospital.json)")
+    parser.add_argument("--json", default=None, help="결과를 JSON으로 저장할 파일")
+    args = parser.parse_args(argv)
+
+    if args.runs < 1:
+        parser.error("--runs는 1 이상이어야 합니다")
+    if args.jobs < 1:
+        parser.error("--jobs는 1 이상이어야 합니다")
+    if args.max_steps < 1:
+        parser.error("--max-steps는 1 이상이어야 합니다")
+    if not 0.0 <= args.noise <= 1.0:
+        parser.error("--noise는 0과 1 사이여야 합니다")
+    if args.script:
+        try:
+            args.script = load_script(args.script)
+        except (OSError, ValueError) as e:
+            parser.error(f"스크립트를 읽을 수 없습니다: {e}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 작업 프로세스마다 다시 읽으므로 시작 전에 한 번 검사
+    load_content(args.content)
+
+    report = run_simulation(args.content, args.runs, min(args.jobs, args.runs), args.seed, args.max_steps,
+                            args.script, args.noise)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
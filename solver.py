@@ -0,0 +1,300 @@
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from escape_engine import DEFAULT_CONTENT, Content, EscapeEngine, load_content
+
+# 콘텐츠 풀이 검사기
+# 엔진 상태(현재 방, 인벤토리, 퍼즐, 방마다 바뀐 아이템/출구)를 해시할 수 있는 키로 만들고
+# 처음 상태에서 할 수 있는 모든 행동을 너비 우선으로 탐색해 상태 그래프를 만든다.
+# 같은 키의 상태는 한 번만 펼치므로 메시지만 바뀌는 행동이나 순서만 다른 경로는 합쳐진다.
+#
+# 그래프에서 다음을 찾는다.
+#   - 가장 짧은 탈출 경로
+#   - 막다른 상태: 탈출할 수 없게 된 상태와, 그런 상태로 처음 넘어가게 만드는 행동
+#   - 한 번도 얻지 못하는 아이템, 가 보지 못하는 방, 한 번도 실행되지 않는 규칙과 경우
+#
+#   python solver.py
+#   python solver.py --content content/hospital.json --json solve.json
+#   python solver.py --max-states 200000
+
+DEFAULT_MAX_STATES = 1_000_000
+
+# 보고서에 보여 줄 막다른 행동 예시 수
+MAX_TRAP_EXAMPLES = 10
+
+def state_key(snapshot: dict) -> tuple:
+    """스냅샷의 해시 키 (인벤토리 순서는 게임 진행에 영향이 없으므로 정렬)"""
+    rooms = snapshot.get("rooms")
+    changed = ()
+    if rooms:
+        changed = tuple((key, tuple(room["items"]) if "items" in room else None,
+                         tuple(room["exits"]) if "exits" in room else None)
+                        for key, room in rooms.items())
+    return (snapshot["room"], snapshot.get("state", "playing"), tuple(sorted(snapshot["inv"])),
+            snapshot["p"], changed)
+
+def rule_labels(content: Content) -> Dict[int, str]:
+    """규칙의 경우(와 아이템 넣기 성공/실패 분기)마다 효과 튜플 id → 이름표"""
+    labels = {}
+
+    def label(effects, name):
+        if not effects:
+            return
+        labels[id(effects)] = name
+        for effect in effects:
+            if effect[0] in ("give_item", "take_item"):
+                label(effect[2], f"{name} {effect[1]} 성공")
+                label(effect[3], f"{name} {effect[1]} 가득 참")
+
+    for kind, table in (("상호작용", content.interactions), ("아이템 사용", content.item_uses)):
+        for (room, action), cases in table.items():
+            for i, (_, effects) in enumerate(cases):
+                label(effects, f"{kind} {room}/{action} #{i + 1}")
+    return labels
+
+class TracingEngine(EscapeEngine):
+    """실행한 규칙 효과를 기록하는 엔진 (메시지는 보내지 않음)"""
+
+    def __init__(self, content: Content):
+        super().__init__(content=content)
+        self.applied = set()
+
+    def notify(self, message: str, duration: float = 2.0):
+        self.last_message = message
+
+    def _apply(self, effects: tuple):
+        self.applied.add(id(effects))
+        super()._apply(effects)
+
+class StateGraph:
+    """처음 상태에서 갈 수 있는 모든 상태와 행동
+
+    상태는 발견한 순서대로 번호를 매기고, 번호 0이 처음 상태다.
+    스냅샷은 펼칠 때까지만 큐에 두고, 그래프에는 키와 분석에 필요한 값만 남긴다.
+    """
+
+    def __init__(self, content: Content):
+        self.content = content
+        self.index: Dict[tuple, int] = {}  # 상태 키 → 번호
+        self.rooms: List[str] = []  # 상태마다 현재 방
+        self.parent: List[Optional[Tuple[int, tuple]]] = []  # 처음 발견한 (이전 상태, 행동)
+        self.edges: List[List[Tuple[tuple, int]]] = []  # 상태를 바꾸는 (행동, 다음 상태)
+        self.escaped: List[int] = []
+        self.held = set()  # 한 번이라도 인벤토리에 들어간 아이템
+        self.applied = set()
+        self.truncated = False
+        self.open = set()  # 최대 상태 수 때문에 다음 상태를 다 넣지 못한 상태
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def add(self, snapshot: dict, parent: Optional[Tuple[int, tuple]]) -> Tuple[int, bool]:
+        """상태 번호와 새로 발견했는지 여부"""
+        key = state_key(snapshot)
+        state = self.index.get(key)
+        if state is not None:
+            return state, False
+        state = len(self.rooms)
+        self.index[key] = state
+        self.rooms.append(snapshot["room"])
+        self.held.update(snapshot["inv"])
+        self.parent.append(parent)
+        self.edges.append([])
+        if snapshot.get("state") == "escaped":
+            self.escaped.append(state)
+        return state, True
+
+    def path(self, state: int) -> List[tuple]:
+        """처음 상태에서 state까지의 가장 짧은 행동 목록"""
+        actions = []
+        while self.parent[state] is not None:
+            state, action = self.parent[state]
+            actions.append(action)
+        actions.reverse()
+        return actions
+
+def explore(content: Content, max_states: int = DEFAULT_MAX_STATES) -> StateGraph:
+    """처음 상태에서 너비 우선 탐색 (탈출한 상태는 더 펼치지 않음)"""
+    engine = TracingEngine(content)
+    graph = StateGraph(content)
+    start = engine.snapshot()
+    graph.add(start, None)
+    queue = deque([(0, start)])
+
+    while queue:
+        state, snapshot = queue.popleft()
+        if snapshot.get("state") == "escaped":
+            continue
+        engine.restore(snapshot)
+        for action in engine.actions():
+            engine.perform(action)
+            after = engine.snapshot()
+            if after == snapshot:
+                # 메시지만 보여 주는 행동이 대부분이므로 되돌릴 필요가 없음
+                continue
+            engine.restore(snapshot)
+            if len(graph) >= max_states and state_key(after) not in graph.index:
+                graph.truncated = True
+                graph.open.add(state)
+                continue
+            target, new = graph.add(after, (state, action))
+            graph.edges[state].append((action, target))
+            if new:
+                queue.append((target, after))
+
+    graph.applied = engine.applied
+    return graph
+
+def reaching(graph: StateGraph, targets) -> List[bool]:
+    """상태마다 targets 중 하나에 닿을 수 있는지 (역방향 너비 우선 탐색)"""
+    incoming: List[List[int]] = [[] for _ in range(len(graph))]
+    for state, edges in enumerate(graph.edges):
+        for _, target in edges:
+            incoming[target].append(state)
+
+    live = [False] * len(graph)
+    queue = deque(targets)
+    for state in queue:
+        live[state] = True
+    while queue:
+        state = queue.popleft()
+        for source in incoming[state]:
+            if not live[source]:
+                live[source] = True
+                queue.append(source)
+    return live
+
+def describe(action: tuple) -> str:
+    kind, target = action
+    return f"{kind}:{target}"
+
+def analyze(graph: StateGraph) -> dict:
+    """가장 짧은 해답, 막다른 상태, 도달할 수 없는 콘텐츠
+
+    탐색이 최대 상태 수에서 멈췄으면 펼치지 못한 상태에 닿을 수 있는 상태는 막다른지 알 수 없으므로
+    막다른 상태에서 빼고, 모든 상태를 봐야 알 수 있는 도달 불가 항목은 None으로 둔다.
+    """
+    content = graph.content
+    live = reaching(graph, graph.escaped)
+    unknown = reaching(graph, graph.open)
+    dead = [not live[state] and not unknown[state] for state in range(len(graph))]
+
+    solution = None
+    if graph.escaped:
+        # 너비 우선 탐색이므로 처음 발견한 탈출 상태가 가장 가까움
+        solution = [describe(action) for action in graph.path(graph.escaped[0])]
+
+    # 탈출할 수 있던 상태에서 막다른 상태로 넘어가는 행동을 (방, 행동)별로 묶음
+    traps = {}
+    for state, edges in enumerate(graph.edges):
+        if not live[state]:
+            continue
+        for action, target in edges:
+            if not dead[target]:
+                continue
+            key = (graph.rooms[state], describe(action))
+            if key not in traps:
+                traps[key] = {"room": key[0], "action": key[1], "count": 0,
+                              "example": [describe(a) for a in graph.path(state)] + [key[1]]}
+            traps[key]["count"] += 1
+
+    unreachable = {"items": None, "rooms": None, "cases": None}
+    if not graph.truncated:
+        visited_rooms = set(graph.rooms)
+        labels = rule_labels(content)
+        applied = {labels[effects] for effects in graph.applied if effects in labels}
+        unreachable = {
+            "items": [name for name in content.items if name not in graph.held],
+            "rooms": [room for room in content.rooms if room not in visited_rooms],
+            "cases": sorted(set(labels.values()) - applied),
+        }
+
+    unused_rules = []
+    for room, action in content.interactions:
+        available = room == "*" or action in content.rooms[room]["interactions"]
+        if not available:
+            unused_rules.append(f"상호작용 {room}/{action} (방의 상호작용 목록에 없음)")
+
+    return {
+        "states": len(graph),
+        "truncated": graph.truncated,
+        "solvable": bool(graph.escaped),
+        "solution": solution,
+        "escape_states": len(graph.escaped),
+        "dead_end_states": sum(dead),
+        "unknown_states": sum(1 for state in range(len(graph)) if unknown[state] and not live[state]),
+        "traps": sorted(traps.values(), key=lambda trap: (-trap["count"], trap["room"], trap["action"])),
+        "unreachable_items": unreachable["items"],
+        "unreachable_rooms": unreachable["rooms"],
+        "unused_rules": unused_rules,
+        "unreached_cases": unreachable["cases"],
+    }
+
+def print_report(report: dict, seconds: float):
+    print(f"상태 {report['states']}개 탐색 ({seconds:.2f}초"
+          f"{', 최대 상태 수에서 멈춤' if report['truncated'] else ''})")
+    if report["solvable"]:
+        print(f"\n가장 짧은 탈출 경로 ({len(report['solution'])}단계):")
+        for i, action in enumerate(report["solution"], 1):
+            print(f"  {i:3}. {action}")
+    elif report["truncated"]:
+        print("\n⚠ 최대 상태 수 안에서 탈출 경로를 찾지 못했습니다.")
+    else:
+        print("\n⚠ 탈출할 수 없습니다.")
+
+    print(f"\n막다른 상태: {report['dead_end_states']}개")
+    if report["unknown_states"]:
+        print(f"  (펼치지 못한 상태로 이어져 알 수 없는 상태 {report['unknown_states']}개는 제외)")
+    for trap in report["traps"][:MAX_TRAP_EXAMPLES]:
+        print(f"  {trap['room']}에서 {trap['action']} ({trap['count']}번)")
+        print(f"    예: {' → '.join(trap['example'])}")
+    if len(report["traps"]) > MAX_TRAP_EXAMPLES:
+        print(f"  ... 외 {len(report['traps']) - MAX_TRAP_EXAMPLES}개")
+
+    sections = (
+        ("얻을 수 없는 아이템", report["unreachable_items"]),
+        ("갈 수 없는 방", report["unreachable_rooms"]),
+        ("쓰이지 않는 규칙", report["unused_rules"]),
+        ("한 번도 실행되지 않는 경우", report["unreached_cases"]),
+    )
+    for title, entries in sections:
+        if entries is None:
+            print(f"\n{title}: 건너뜀 (모든 상태를 탐색하지 않았음)")
+            continue
+        print(f"\n{title}: {len(entries)}개")
+        for entry in entries:
+            print(f"  {entry}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="콘텐츠를 끝까지 풀 수 있는지 상태 그래프로 검사")
+    parser.add_argument("--content", default=DEFAULT_CONTENT, help="콘텐츠 파일 (기본: content/hospital.json)")
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES,
+                        help=f"탐색할 최대 상태 수 (기본: {DEFAULT_MAX_STATES})")
+    parser.add_argument("--json", default=None, help="결과를 JSON으로 저장할 파일")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    content = load_content(args.content)
+
+    start = time.perf_counter()
+    graph = explore(content, args.max_states)
+    report = analyze(graph)
+    seconds = time.perf_counter() - start
+
+    print_report(report, seconds)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+    # 탈출할 수 없으면 종료 코드 1, 최대 상태 수 안에서 찾지 못했으면 2
+    if report["solvable"]:
+        return 0
+    return 2 if report["truncated"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+from typing import Callable, List, Optional, Tuple
+
+# 규칙 표로 바꾸기 전의 방탈출 게임 로직 (상호작용과 아이템 사용이 if/elif)
+# 동작 비교 테스트(test_escape_engine.py)의 기준으로만 쓰고, 게임 코드는 이 파일을 쓰지 않는다.
+
+# 행동 종류 → 처리 메서드 이름 (행동은 (종류, 대상) 튜플)
+ACTIONS = {
+    "interact": "interact",
+    "collect": "collect_item",
+    "move": "move_to_room",
+    "use": "use_item",
+}
+
+class Item:
+    def __init__(self, name: str, description: str, image_key: str = None):
+        self.name = name
+        self.description = description
+        self.image_key = image_key
+        self.used = False
+
+class Inventory:
+    def __init__(self):
+        self.items: List[Item] = []
+        self.max_items = 8
+        
+    def add_item(self, item: Item) -> bool:
+        if len(self.items) < self.max_items:
+            self.items.append(item)
+            return True
+        return False
+        
+    def remove_item(self, item_name: str) -> Optional[Item]:
+        for i, item in enumerate(self.items):
+            if item.name == item_name:
+                return self.items.pop(i)
+        return None
+        
+    def has_item(self, item_name: str) -> bool:
+        return any(item.name == item_name for item in self.items)
+        
+    def use_item(self, item_name: str) -> bool:
+        for item in self.items:
+            if item.name == item_name and not item.used:
+                item.used = True
+                return True
+        return False
+
+class EscapeEngine:
+    def __init__(self, on_message: Optional[Callable[[str, float], None]] = None):
+        self.current_room = "exterior"
+        self.inventory = Inventory()
+        self.game_state = "playing"  # playing, escaped, game_over
+        self.on_message = on_message
+        self.last_message = ""
+        
+        # 아이템 정의
+        self.items = {
+            "열쇠": Item("열쇠", "낡은 열쇠. 어딘가의 문을 열 수 있을 것 같다."),
+            "전지": Item("전지", "AA 전지. 전자기기에 사용할 수 있다."),
+            "테이프": Item("테이프", "낡은 VHS 테이프. 녹화된 내용이 있을 것 같다."),
+            "의료기록": Item("의료기록", "환자의 의료기록. 중요한 정보가 담겨있다."),
+            "카드키": Item("카드키", "보안 카드키. 특정 문을 열 수 있다."),
+            "지도": Item("지도", "병원 지도. 출구를 찾는 데 도움이 될 것이다."),
+            "손전등": Item("손전등", "휴대용 손전등. 어둠을 밝힐 수 있다."),
+            "비상등": Item("비상등", "비상 탈출구용 등. 탈출할 때 사용한다."),
+            "탈출열쇠": Item("탈출열쇠", "비상 탈출구용 열쇠. 시체안치실에서 사용할 수 있다.")
+        }
+        
+        # 방별 설정
+        self.rooms = {
+            "exterior": {
+                "name": "병원 외부",
+                "description": "버려진 병원 앞. 차가운 바람이 휘돈다. 정문이 잠겨있다.",
+                "items": ["열쇠"],
+                "interactions": ["정문 열기"],
+                "exits": []
+            },
+            "lobby": {
+                "name": "로비",
+                "description": "로비에는 먼지 냄새와 곰팡이 냄새가 섞여 있다. 붉은 비상등이 깜빡인다.",
+                "items": ["지도"],
+                "interactions": ["비상등 확인"],
+                "exits": ["corridor", "security"]
+            },
+            "corridor": {
+                "name": "복도",
+                "description": "긴 복도 끝에서 금속이 끄는 소리가 들린다. 휠체어가 혼자 움직이는 듯 흔들린다.",
+                "items": [],
+                "interactions": ["휠체어 확인"],
+                "exits": ["lobby", "ward", "operating", "stairs"]
+            },
+            "security": {
+                "name": "보안실",
+                "description": "보안실. 꺼진 모니터가 줄지어 있고, 낡은 영상기록 장치가 덩그러니 놓여 있다.",
+                "items": ["테이프"],
+                "interactions": ["모니터 켜기", "테이프 재생"],
+                "exits": ["lobby"],
+                "requires": {"카드키": "카드키가 필요하다."}
+            },
+            "ward": {
+                "name": "병동",
+                "description": "병동 병실. 커튼이 바람도 없는데 가볍게 흔들린다. 금고가 있는 서랍이 있다.",
+                "items": ["의료기록"],
+                "interactions": ["커튼 확인", "병상 확인", "서랍 열기"],
+                "exits": ["corridor"]
+            },
+            "operating": {
+                "name": "수술실",
+                "description": "수술실. 작업등 몇 개가 아직 살아 있다. 바닥에는 오래된 얼룩이 남아 있다.",
+                "items": ["전지"],
+                "interactions": ["수술대 확인", "도구함 열기"],
+                "exits": ["corridor"]
+            },
+            "stairs": {
+                "name": "계단",
+                "description": "계단실. 아래로 내려갈수록 공기가 차갑고 무거워진다.",
+                "items": ["손전등"],
+                "interactions": ["지하 내려가기"],
+                "exits": ["corridor", "morgue"]
+            },
+            "morgue": {
+                "name": "시체안치실",
+                "description": "시체안치실. 서랍 몇 개가 반쯤 열려 있다. 이름표가 떨리는 듯 흔들린다. 벽에 비상 탈출구가 있다.",
+                "items": ["카드키", "비상등"],
+                "interactions": ["서랍 확인", "비상 탈출구 열기", "비상등 설치", "열쇠 사용"],
+                "exits": ["stairs"],
+                "requires": {"손전등": "어둡다. 손전등이 필요하다."}
+            }
+        }
+        
+        # 퍼즐 상태
+        self.puzzles = {
+            "security_monitor": False,  # 보안실 모니터 켜짐
+            "tape_played": False,       # 테이프 재생됨
+            "password_revealed": False, # 비밀번호 발견됨
+            "drawer_opened": False,     # 서랍 열림
+            "exit_ready": False         # 탈출구 준비됨
+        }
+    
+    def notify(self, message: str, duration: float = 2.0):
+        """메시지를 알림 (duration은 화면에 표시할 시간, 초)"""
+        self.last_message = message
+        if self.on_message is not None:
+            self.on_message(message, duration)
+    
+    def actions(self) -> List[Tuple[str, str]]:
+        """지금 할 수 있는 행동 목록 (화면의 버튼과 인벤토리 줄에 해당)"""
+        room = self.rooms[self.current_room]
+        actions = [("interact", name) for name in room["interactions"]]
+        actions += [("collect", name) for name in room["items"]]
+        actions += [("move", name) for name in room["exits"]]
+        actions += [("use", item.name) for item in self.inventory.items]
+        return actions
+    
+    def perform(self, action: Tuple[str, str]):
+        """(종류, 대상) 행동 실행"""
+        kind, target = action
+        if kind not in ACTIONS:
+            raise ValueError(f"알 수 없는 행동: {kind}")
+        getattr(self, ACTIONS[kind])(target)
+    
+    def can_enter_room(self, room_name: str) -> tuple[bool, str]:
+        room = self.rooms[room_name]
+        if "requires" in room:
+            for item, message in room["requires"].items():
+                if not self.inventory.has_item(item):
+                    return False, message
+        return True, ""
+    
+    def move_to_room(self, room_name: str):
+        can_enter, message = self.can_enter_room(room_name)
+        if can_enter:
+            self.current_room = room_name
+            self.notify(f"{self.rooms[room_name]['name']}에 도착했다.")
+        else:
+            self.notify(message)
+    
+    def collect_item(self, item_name: str):
+        if item_name in self.items and item_name in self.rooms[self.current_room]["items"]:
+            if self.inventory.add_item(self.items[item_name]):
+                self.rooms[self.current_room]["items"].remove(item_name)
+                self.notify(f"{item_name}을(를) 획득했다!")
+            else:
+                self.notify("인벤토리가 가득 찼다.")
+        else:
+            self.notify("그런 아이템은 없다.")
+    
+    def use_item(self, item_name: str):
+        if not self.inventory.has_item(item_name):
+            self.notify("그런 아이템은 없다.")
+            return
+        
+        # 특정 아이템 사용 로직
+        if item_name == "열쇠" and self.current_room == "exterior":
+            self.move_to_room("lobby")
+            self.inventory.remove_item("열쇠")
+        elif item_name == "전지" and self.current_room == "security":
+            if not self.puzzles["security_monitor"]:
+                self.puzzles["security_monitor"] = True
+                self.notify("모니터가 켜졌다!")
+                self.inventory.remove_item("전지")
+            else:
+                self.notify("모니터가 이미 켜져 있다.")
+        elif item_name == "테이프" and self.current_room == "security":
+            if self.puzzles["security_monitor"]:
+                if not self.puzzles["tape_played"]:
+                    self.puzzles["tape_played"] = True
+                    self.notify("테이프에서 중요한 정보를 발견했다!")
+                    self.inventory.remove_item("테이프")
+                else:
+                    self.notify("테이프를 이미 재생했다.")
+            else:
+                self.notify("먼저 모니터를 켜야 한다.")
+        elif item_name == "손전등":
+            self.notify("손전등은 시체안치실에 들어가기 위해 필요하다.")
+        elif item_name == "비상등" and self.current_room == "morgue":
+            self.notify("비상등을 설치하려면 '비상등 설치' 버튼을 클릭하세요.")
+        elif item_name == "탈출열쇠" and self.current_room == "morgue":
+            self.notify("탈출열쇠를 사용하려면 '열쇠 사용' 버튼을 클릭하세요.")
+        elif item_name == "카드키":
+            if self.current_room == "lobby":
+                self.notify("카드키로 보안실 문을 열 수 있다.")
+            elif self.current_room == "security":
+                self.notify("보안실에 이미 들어왔다.")
+            else:
+                self.notify("카드키는 보안실에서 사용할 수 있다.")
+        elif item_name == "지도":
+            self.notify("병원 지도: 외부 → 로비 → 복도 → 보안실/병동/수술실/계단 → 시체안치실")
+        elif item_name == "의료기록":
+            self.notify("의료기록에는 '환자 관찰 중'이라는 기록이 있다.")
+        else:
+            self.notify(f"{item_name}을(를) 여기서 사용할 수 없다.")
+    
+    def interact(self, interaction: str):
+        room = self.rooms[self.current_room]
+        
+        if interaction == "정문 열기" and self.current_room == "exterior":
+            if self.inventory.has_item("열쇠"):
+                self.notify("정문이 열렸다! 로비로 들어갈 수 있다.")
+                # 정문을 열면 로비로 이동할 수 있게 함
+                self.rooms["exterior"]["exits"] = ["lobby"]
+            else:
+                self.notify("열쇠가 필요하다.")
+        elif interaction == "출구 찾기" and self.current_room == "lobby":
+            self.notify("정문은 잠겨있다. 다른 출구를 찾아야 한다.")
+        elif interaction == "비상등 확인" and self.current_room == "lobby":
+            self.notify("비상등이 깜빡인다. 무언가를 알려주는 것 같다.")
+        elif interaction == "휠체어 확인" and self.current_room == "corridor":
+            self.notify("휠체어는 아직 따뜻하다. 누군가 최근에 사용한 것 같다.")
+        elif interaction == "모니터 켜기" and self.current_room == "security":
+            if self.puzzles["security_monitor"]:
+                self.notify("모니터가 이미 켜져 있다.")
+            elif self.inventory.has_item("전지"):
+                self.puzzles["security_monitor"] = True
+                self.notify("모니터가 켜졌다!")
+                self.inventory.remove_item("전지")
+            else:
+                self.notify("전지가 필요하다.")
+        elif interaction == "테이프 재생" and self.current_room == "security":
+            if self.puzzles["tape_played"]:
+                self.notify("테이프를 이미 재생했다.")
+            elif self.puzzles["security_monitor"] and self.inventory.has_item("테이프"):
+                self.puzzles["tape_played"] = True
+                self.puzzles["password_revealed"] = True
+                self.notify("테이프에서 비밀번호를 발견했다: 1-9-7-3")
+                self.inventory.remove_item("테이프")
+            elif not self.puzzles["security_monitor"]:
+                self.notify("먼저 모니터를 켜야 한다.")
+            else:
+                self.notify("테이프가 필요하다.")
+        elif interaction == "커튼 확인" and self.current_room == "ward":
+            self.notify("커튼 뒤에는 아무것도 없다.")
+        elif interaction == "병상 확인" and self.current_room == "ward":
+            self.notify("병상에는 오래된 시트만 깔려있다.")
+        elif interaction == "서랍 열기" and self.current_room == "ward":
+            if self.puzzles["password_revealed"]:
+                if not self.puzzles["drawer_opened"]:
+                    self.puzzles["drawer_opened"] = True
+                    self.notify("서랍이 열렸다! 탈출열쇠를 발견했다!")
+                    # 탈출열쇠를 바로 인벤토리에 추가
+                    if self.inventory.add_item(self.items["탈출열쇠"]):
+                        self.notify("탈출열쇠를 획득했다!")
+                    else:
+                        self.notify("인벤토리가 가득 찼다.")
+                else:
+                    self.notify("서랍은 이미 열려있다.")
+            else:
+                self.notify("잠겨있다.")
+        elif interaction == "수술대 확인" and self.current_room == "operating":
+            self.notify("수술대에는 오래된 얼룩이 남아있다.")
+        elif interaction == "도구함 열기" and self.current_room == "operating":
+            self.notify("도구함은 비어있다.")
+        elif interaction == "지하 내려가기" and self.current_room == "stairs":
+            self.move_to_room("morgue")
+        elif interaction == "서랍 확인" and self.current_room == "morgue":
+            if "카드키" in room["items"]:
+                self.notify("서랍에서 카드키를 발견했다!")
+                if self.inventory.add_item(self.items["카드키"]):
+                    self.rooms[self.current_room]["items"].remove("카드키")
+                    self.notify("카드키를 획득했다!")
+                else:
+                    self.notify("인벤토리가 가득 찼다.")
+            else:
+                self.notify("서랍은 이미 비어있다.")
+        elif interaction == "비상등 설치" and self.current_room == "morgue":
+            if self.inventory.has_item("비상등"):
+                self.puzzles["exit_ready"] = True
+                self.notify("비상등을 설치했다. 탈출구가 밝혀졌다!")
+                self.inventory.remove_item("비상등")
+            else:
+                self.notify("비상등이 필요하다.")
+        elif interaction == "열쇠 사용" and self.current_room == "morgue":
+            if self.inventory.has_item("탈출열쇠"):
+                if self.puzzles["exit_ready"]:
+                    self.notify("탈출열쇠를 비상 탈출구에 끼웠다!")
+                    self.inventory.remove_item("탈출열쇠")
+                else:
+                    self.notify("먼저 비상등을 설치해야 한다.")
+            else:
+                self.notify("탈출열쇠가 필요하다.")
+        elif interaction == "비상 탈출구 열기" and self.current_room == "morgue":
+            if self.puzzles["exit_ready"]:
+                self.game_state = "escaped"
+                self.notify("비상 탈출구를 열고 탈출에 성공했다!", 5.0)
+            else:
+                self.notify("비상등과 탈출열쇠가 필요하다.")
+        else:
+            self.notify("그런 상호작용은 없다.")
@@ -0,0 +1,80 @@
+import copy
+import json
+import random
+
+import pytest
+
+import legacy_engine
+from escape_engine import DEFAULT_CONTENT, Content, ContentError, EscapeEngine
+
+# 규칙 표 엔진이 이전 if/elif 엔진과 같은 메시지와 상태를 내는지 무작위 플레이로 비교
+DIFF_RUNS = 3000
+DIFF_STEPS = 120
+DIFF_SEED = 7
+
+def hospital() -> dict:
+    with open(DEFAULT_CONTENT, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def state(engine) -> tuple:
+    return (engine.current_room, engine.game_state, tuple(item.name for item in engine.inventory.items),
+            tuple(sorted(engine.puzzles.items())),
+            tuple((key, tuple(room["items"]), tuple(room["exits"])) for key, room in engine.rooms.items()))
+
+def test_rule_table_matches_legacy_engine():
+    reference = legacy_engine.EscapeEngine()
+    interactions = set(["출구 찾기", "없는 행동"])
+    for room in reference.rooms.values():
+        interactions.update(room["interactions"])
+    interactions = sorted(interactions)
+    items = list(reference.items) + ["없는거"]
+    rooms = list(reference.rooms)
+
+    rng = random.Random(DIFF_SEED)
+    for _ in range(DIFF_RUNS):
+        old_messages, new_messages = [], []
+        old = legacy_engine.EscapeEngine(lambda message, duration: old_messages.append((message, duration)))
+        new = EscapeEngine(lambda message, duration: new_messages.append((message, duration)))
+        for _ in range(DIFF_STEPS):
+            # 할 수 있는 행동 외에 없는 상호작용/아이템, 갈 수 없는 방도 섞음
+            r = rng.random()
+            if r < 0.5:
+                action = rng.choice(old.actions())
+            elif r < 0.7:
+                action = ("interact", rng.choice(interactions))
+            elif r < 0.8:
+                action = ("use", rng.choice(items))
+            elif r < 0.9:
+                action = ("collect", rng.choice(items))
+            else:
+                action = ("move", rng.choice(rooms))
+            # 가끔 다른 방으로 옮겨 "*" 규칙과 방 전용 규칙의 우선순위도 확인
+            if rng.random() < 0.05:
+                old.current_room = new.current_room = rng.choice(rooms)
+
+            old.perform(action)
+            new.perform(action)
+            assert new_messages == old_messages, action
+            assert state(new) == state(old), action
+
+def test_hospital_content_loads():
+    content = Content(hospital())
+    assert content.start_room == "exterior"
+
+@pytest.mark.parametrize("edit", [
+    lambda data: data["rooms"]["lobby"]["exits"].append("nowhere"),
+    lambda data: data["rooms"]["lobby"]["items"].append("없는거"),
+    lambda data: data["rooms"]["morgue"]["requires"].update({"없는거": "..."}),
+    lambda data: data["rooms"]["ward"].pop("exits"),
+    lambda data: data["rooms"]["ward"]["interactions"].append("규칙 없는 상호작용"),
+    lambda data: data.update(start_room="nowhere"),
+    lambda data: data.update(inventory_size=0),
+    lambda data: data["messages"].pop("arrived"),
+    lambda data: data["messages"].update(collected="{name}을(를) 획득했다!"),
+    lambda data: data["interactions"][0]["cases"][0]["if"].update(has="없는거"),
+])
+def test_content_typos_raise(edit):
+    data = copy.deepcopy(hospital())
+    edit(data)
+    with pytest.raises(ContentError):
+        Content(data)
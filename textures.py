@@ -0,0 +1,11 @@
+from PIL import Image, ImageFilter
+import random
+
+def create_noise_texture(width, height, scale=50, rng=random):
+    """노이즈 텍스처 생성"""
+    # 픽셀 단위 루프 대신 난수 바이트로 그레이스케일 버퍼를 한 번에 생성
+    img = Image.frombytes('L', (width, height), rng.randbytes(width * height))
+
+    # 블러 효과 (단일 채널에서 처리한 뒤 RGB로 변환)
+    img = img.filter(ImageFilter.GaussianBlur(scale))
+    return img.convert('RGB')
@@ -0,0 +1,97 @@
+import pygame
+
+# 화면 위젯과 공용 위치 색인
+# 레이아웃은 상태가 바뀔 때 한 번만 계산해 위젯 목록에 담아 두고,
+# 그리기, 마우스 올림(MOUSEMOTION), 클릭 판정이 모두 같은 위젯과 격자 색인을 쓴다.
+
+GRID_CELL = 64
+
+class Widget:
+    """클릭할 수 있는 화면 영역
+
+    action은 클릭했을 때 돌려줄 값이고, text_rect는 글자를 그릴 위치다.
+    """
+
+    def __init__(self, rect, action, group: str = "", label: str = "", text_rect=None):
+        self.rect = pygame.Rect(rect)
+        self.action = action
+        self.group = group
+        self.label = label
+        self.text_rect = pygame.Rect(text_rect) if text_rect is not None else None
+        self.index = 0  # 같은 group 안에서의 순서
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        """위젯이 그리는 범위 (글자가 버튼보다 넓을 수도 있음)"""
+        if self.text_rect is None:
+            return self.rect
+        return self.rect.union(self.text_rect)
+
+class HitGrid:
+    """고정 크기 격자 칸마다 겹치는 위젯을 담아 두고 한 점에 닿는 위젯을 찾는 색인
+
+    위젯은 넣은 순서가 우선순위다 (겹치면 먼저 넣은 위젯이 클릭을 받는다).
+    """
+
+    def __init__(self, cell: int = GRID_CELL):
+        self.cell = cell
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, widget: Widget):
+        rect = widget.rect
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        for cx in range(rect.left // self.cell, (rect.right - 1) // self.cell + 1):
+            for cy in range(rect.top // self.cell, (rect.bottom - 1) // self.cell + 1):
+                self.cells.setdefault((cx, cy), []).append(widget)
+
+    def hit(self, pos):
+        for widget in self.cells.get((pos[0] // self.cell, pos[1] // self.cell), ()):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+class WidgetLayer:
+    """한 화면의 위젯 목록, 위치 색인, 마우스가 올라가 있는 위젯"""
+
+    def __init__(self):
+        self.widgets = []
+        self.groups = {}
+        self.grid = HitGrid()
+        self.hovered = None
+        self.mouse_pos = None
+        self.version = 0  # 레이아웃을 다시 계산할 때마다 증가
+
+    def set_widgets(self, widgets):
+        self.widgets = list(widgets)
+        self.groups = {}
+        self.grid.clear()
+        for widget in self.widgets:
+            group = self.groups.setdefault(widget.group, [])
+            widget.index = len(group)
+            group.append(widget)
+            self.grid.insert(widget)
+        self.version += 1
+        self.hovered = self.hit(self.mouse_pos) if self.mouse_pos is not None else None
+
+    def group(self, name: str):
+        return self.groups.get(name, [])
+
+    def hit(self, pos):
+        return self.grid.hit(pos)
+
+    def hover(self, pos) -> bool:
+        """마우스 위치를 갱신하고 올라가 있는 위젯이 바뀌었는지 반환"""
+        self.mouse_pos = pos
+        hovered = self.hit(pos)
+        changed = hovered is not self.hovered
+        self.hovered = hovered
+        return changed
+
+    def hovered_index(self, group: str) -> int:
+        if self.hovered is not None and self.hovered.group == group:
+            return self.hovered.index
+        return -1